@@ -4,31 +4,549 @@ Driver Detection CLI Tool
 Utility to detect and list drivers for installation
 """
 
+import os
 import sys
 import argparse
+import functools
 import logging
 import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List, Optional
 
 from utils.logging_config import setup_logging
 from utils.driver_detector import (
+    iter_available_drivers,
     list_available_drivers,
     list_installed_drivers,
     list_not_installed_drivers,
     list_drivers_with_different_versions,
     list_drivers_needing_update,
-    export_driver_list
+    build_installed_index,
+    is_driver_installed,
+    export_driver_list,
+    INSTALLED_DRIVERS_CACHE_TTL
 )
-from utils.vendor_database import (
-    get_vendor_info,
-    is_generic_windows_driver,
-    detect_device_type,
-    generate_filename
-)
-from utils.download_url_helper import suggest_download_url
+try:
+    import orjson
+except ImportError:  # Optional accelerator, stdlib json is used otherwise
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Default 'os' value for manifest entries generated from this system
+_DEFAULT_OS = 'windows' if sys.platform == 'win32' else 'linux'
+
+# Section separators for console output
+_SEP = '=' * 60
+_SEP_NL = '\n' + _SEP
+
+
+def _dump_manifest(data, pretty: bool = False) -> bytes:
+    """Serialize a manifest to UTF-8 JSON bytes (compact unless pretty is set)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _write_grouped_manifest(output_file: Path, drivers_by_manufacturer: dict, manufacturers: List[str], pretty: bool = False) -> None:
+    """
+    Write a manufacturer-grouped manifest one manufacturer at a time
+    
+    Produces the same bytes as _dump_manifest({'manufacturers': [...]}) without
+    building the grouped structure or the whole serialized document in memory.
+    
+    Args:
+        output_file: Destination file
+        drivers_by_manufacturer: Drivers keyed by manufacturer name
+        manufacturers: Manufacturer names in output order
+        pretty: Indent the output for manual editing
+    """
+    if not manufacturers:
+        output_file.write_bytes(_dump_manifest({'manufacturers': []}, pretty=pretty))
+        return
+    
+    if pretty:
+        begin, separator, end = b'{\n  "manufacturers": [\n    ', b',\n    ', b'\n  ]\n}'
+    else:
+        begin, separator, end = b'{"manufacturers":[', b',', b']}'
+    
+    with open(output_file, 'wb') as f:
+        f.write(begin)
+        for index, mfr in enumerate(manufacturers):
+            if index:
+                f.write(separator)
+            chunk = _dump_manifest({'name': mfr, 'drivers': drivers_by_manufacturer[mfr]}, pretty=pretty)
+            if pretty:
+                # Nest the block two levels deep (strings never contain raw newlines)
+                chunk = chunk.replace(b'\n', b'\n    ')
+            f.write(chunk)
+        f.write(end)
+
+
+def _enrich_driver(driver: dict, get_vendor_info, detect_device_type, generate_filename,
+                   suggest_download_url) -> dict:
+    """
+    Build a manifest entry for an installed driver
+    
+    Adds manufacturer, device type, suggested download URL and filename
+    from the vendor database and download patterns.
+    
+    Args:
+        driver: Installed driver dictionary (name, version, deviceId)
+        get_vendor_info, detect_device_type, generate_filename: Helpers from
+            utils.vendor_database, imported once by _handle_create
+        suggest_download_url: Helper from utils.download_url_helper
+        
+    Returns:
+        Manifest entry dictionary
+    """
+    driver_name = driver.get('name', 'Unknown Driver')
+    device_id = driver.get('deviceId', '')
+    version = driver.get('version', 'unknown')
+    
+    # Get vendor information
+    vendor_info = get_vendor_info(device_id)
+    vendor_name = vendor_info['name'] if vendor_info else 'Unknown Manufacturer'
+    vendor_website = vendor_info['website'] if vendor_info else ''
+    
+    # Detect device type
+    device_type = detect_device_type(driver_name, device_id)
+    
+    # Get download URL suggestion from patterns
+    url_suggestion = suggest_download_url(vendor_name, device_type.lower())
+    suggested_url = ''
+    suggested_notes = ''
+    download_example = ''
+    
+    if url_suggestion and url_suggestion.get('found'):
+        # Use example URL as template (direct download link)
+        download_example = url_suggestion.get('example', '')
+        suggested_url = download_example if download_example else vendor_website
+    
+        if url_suggestion.get('notes'):
+            suggested_notes = url_suggestion['notes']
+        logger.debug("Found download pattern for %s %s", vendor_name, device_type)
+    else:
+        # Fallback to vendor website
+        suggested_url = vendor_website
+        logger.debug("No download pattern for %s %s", vendor_name, device_type)
+    
+    # Use data from reference manifest if available, enhance with patterns
+    suggested_filename = generate_filename(vendor_name, driver_name, device_type, version)
+    
+    manifest_entry = {
+        'name': driver_name,
+        'manufacturer': vendor_name,
+        'deviceType': device_type,
+        'version': version,
+        'deviceId': device_id,
+        'url': driver.get('url', suggested_url),  # Use manifest URL or suggested
+        'fileName': driver.get('fileName', suggested_filename),
+        'sha256': driver.get('sha256', ''),
+        'type': driver.get('type', 'exe'),
+        'os': driver.get('os', _DEFAULT_OS),
+        'silentArgs': driver.get('silentArgs', '/S /v"/qn"')
+    }
+    
+    # Add notes if available from patterns
+    if suggested_notes and not driver.get('notes'):
+        manifest_entry['notes'] = suggested_notes
+    
+    return manifest_entry
+
+
+def _write_lines(lines) -> None:
+    """Write a block of output lines to stdout with a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _print_driver_list(results, title, format_driver):
+    """
+    Print a titled list of drivers with a single stdout write
+    
+    Args:
+        results: Drivers (or other entries) to display
+        title: Heading printed above the list
+        format_driver: Callable returning the output lines for one entry
+    """
+    lines = [_SEP_NL, f"{title}: {len(results)}", _SEP]
+    for driver in results:
+        lines += format_driver(driver)
+        lines.append("")
+    _write_lines(lines)
+
+
+# (key, default) pairs shown by the list actions, unpacked once per driver
+_DISPLAY_FIELDS = (
+    ('name', None),
+    ('version', 'unknown'),
+    ('os', 'unknown'),
+    ('type', 'unknown'),
+    ('deviceId', 'N/A'),
+    ('url', 'N/A'),
+)
+
+
+def _display_row(driver: dict) -> tuple:
+    """Return the _DISPLAY_FIELDS values of a driver as a tuple"""
+    get = driver.get
+    return tuple([get(key, default) for key, default in _DISPLAY_FIELDS])
+
+
+def _format_available(driver: dict) -> List[str]:
+    name, version, os_, type_, device_id, _ = _display_row(driver)
+    return [
+        f"  - {name} (v{version})",
+        f"    OS: {os_}, Type: {type_}",
+        f"    Device ID: {device_id}",
+    ]
+
+
+def _format_installed(driver: dict) -> List[str]:
+    name, version, _, _, device_id, _ = _display_row(driver)
+    return [
+        f"  - {name} (v{version})",
+        f"    Device ID: {device_id}",
+    ]
+
+
+def _format_not_installed(driver: dict) -> List[str]:
+    name, version, os_, type_, _, url = _display_row(driver)
+    return [
+        f"  - {name} (v{version})",
+        f"    OS: {os_}, Type: {type_}",
+        f"    URL: {url}",
+    ]
+
+
+def _format_version_diff(version_diff) -> List[str]:
+    available, installed = version_diff
+    name, version, _, _, _, url = _display_row(available)
+    return [
+        f"  - {name}",
+        f"    Available: v{version}",
+        f"    Installed: v{installed.get('version', 'unknown')}",
+        f"    URL: {url}",
+    ]
+
+
+def _format_needing_update(driver: dict) -> List[str]:
+    name, version, os_, type_, _, url = _display_row(driver)
+    current_ver = driver.get('current_version')
+    if current_ver:
+        lines = [
+            f"  - {name} (UPDATE)",
+            f"    Current: v{current_ver}",
+            f"    Available: v{version}",
+        ]
+    else:
+        lines = [
+            f"  - {name} (NEW)",
+            f"    Version: v{version}",
+        ]
+    return lines + [
+        f"    OS: {os_}, Type: {type_}",
+        f"    URL: {url}",
+    ]
+
+
+# Action handlers take the parsed arguments and the manifest path and return
+# the results to export, or None when the action failed
+
+def _handle_available(args, manifest_path: Optional[Path]):
+    """List drivers available in the manifest"""
+    logger.info("Listing available drivers from manifest...")
+    results = list_available_drivers(manifest_path, args.os_filter)
+    _print_driver_list(results, "Available Drivers", _format_available)
+    return results
+
+
+def _handle_installed(args, manifest_path: Optional[Path]):
+    """List drivers installed on the system"""
+    logger.info("Listing installed drivers...")
+    results = list_installed_drivers()
+    _print_driver_list(results, "Installed Drivers", _format_installed)
+    return results
+
+
+def _handle_not_installed(args, manifest_path: Optional[Path]):
+    """List manifest drivers that are not installed"""
+    logger.info("Listing drivers not installed...")
+    results = list_not_installed_drivers(manifest_path, args.os_filter)
+    _print_driver_list(results, "Drivers Not Installed", _format_not_installed)
+    return results
+
+
+def _handle_different_versions(args, manifest_path: Optional[Path]):
+    """List installed drivers whose version differs from the manifest"""
+    logger.info("Listing drivers with different versions...")
+    version_diffs = list_drivers_with_different_versions(manifest_path, args.os_filter)
+    _print_driver_list(version_diffs, "Drivers with Different Versions", _format_version_diff)
+    # For export, convert to list of dicts
+    return [
+        dict(available, installed_version=installed.get('version', 'unknown'))
+        for available, installed in version_diffs
+    ]
+
+
+def _handle_needing_update(args, manifest_path: Optional[Path]):
+    """List drivers that need installation or update"""
+    logger.info("Listing drivers needing installation or update...")
+    results = list_drivers_needing_update(manifest_path, args.os_filter)
+    _print_driver_list(results, "Drivers Needing Installation/Update", _format_needing_update)
+    return results
+
+
+def _handle_create(args, manifest_path: Optional[Path]):
+    """Create a new manifest from the installed drivers"""
+    logger.info("Creating new manifest from installed drivers...")
+    
+    # Vendor tables and URL patterns are only needed by this action
+    from utils.vendor_database import (
+        detect_device_type, generate_filename, get_vendor_info, is_generic_windows_driver
+    )
+    from utils.download_url_helper import suggest_download_url
+    enrich_driver = functools.partial(
+        _enrich_driver,
+        get_vendor_info=get_vendor_info,
+        detect_device_type=detect_device_type,
+        generate_filename=generate_filename,
+        suggest_download_url=suggest_download_url,
+    )
+    
+    # Get currently installed drivers
+    installed_drivers = list_installed_drivers()
+    logger.info(f"Found {len(installed_drivers)} installed drivers")
+    
+    # Process installed drivers and enhance with patterns
+    export_path = args.export or 'drivers.json'
+    unique_drivers = []
+    seen_drivers = set()  # Track duplicates
+    skipped_count = 0
+    
+    # Resolve the debug level once instead of on every skipped driver
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    
+    for driver in installed_drivers:
+        driver_name = driver.get('name', 'Unknown Driver')
+        device_id = driver.get('deviceId', '')
+        version = driver.get('version', 'unknown')
+        
+        # Skip generic Windows drivers
+        if is_generic_windows_driver(driver_name):
+            skipped_count += 1
+            if debug_enabled:
+                logger.debug("Skipping generic Windows driver: %s", driver_name)
+            continue
+        
+        # Skip duplicates
+        duplicate_key = device_id if device_id else f"{driver_name}_{version}"
+        if duplicate_key in seen_drivers:
+            skipped_count += 1
+            if debug_enabled:
+                logger.debug("Skipping duplicate: %s", driver_name)
+            continue
+        
+        seen_drivers.add(duplicate_key)
+        unique_drivers.append(driver)
+    
+    # Enrich the remaining drivers concurrently (map keeps the original order)
+    # and bucket them by manufacturer as they complete
+    drivers_by_manufacturer = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+        for driver in executor.map(enrich_driver, unique_drivers):
+            drivers_by_manufacturer[driver.get('manufacturer', 'Unknown Manufacturer')].append(driver)
+    manufacturers = sorted(drivers_by_manufacturer)
+    
+    lines = [
+        _SEP_NL,
+        f"Detected Drivers: {len(unique_drivers)}",
+        _SEP,
+        "System scan complete.",
+        f"  - Found {len(installed_drivers)} total drivers",
+        f"  - Skipped {skipped_count} (generic/duplicate drivers)",
+        f"  - Included {len(unique_drivers)} unique hardware drivers",
+        "",
+        "Drivers by Manufacturer:",
+    ]
+    lines += [f"  - {mfr}: {len(drivers_by_manufacturer[mfr])} driver(s)" for mfr in manufacturers]
+    lines += [
+        "",
+        "Generated manifest includes:",
+        "  [+] Manufacturer names",
+        "  [+] Direct download URLs (where available)",
+        "  [+] Auto-generated filenames",
+        "  [+] Device types",
+        "  [+] Duplicates removed",
+        "",
+        "Next steps:",
+        "  1. Review and update URLs/versions as needed",
+        "  2. Use this as reference: python detect-drivers.py --action scan --manifest drivers.json",
+        "",
+    ]
+    _write_lines(lines)
+    
+    # Export grouped structure
+    logger.info(f"Exporting detected drivers to: {export_path}")
+    
+    try:
+        output_file = Path(export_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        _write_grouped_manifest(output_file, drivers_by_manufacturer, manufacturers, pretty=args.pretty)
+        
+        logger.info(f"Exported drivers grouped by manufacturer to: {export_path}")
+        _write_lines([
+            f"\n[OK] Drivers manifest created: {export_path}",
+            "\nThis file contains all detected hardware drivers.",
+            "Use as reference for future scans!",
+        ])
+        
+    except Exception as e:
+        logger.error(f"Failed to export drivers: {e}")
+        print(f"[ERROR] Failed to create drivers manifest: {e}")
+        return None
+    
+    return drivers_by_manufacturer
+
+
+def _handle_scan(args, manifest_path: Optional[Path]):
+    """Write a manifest with the reference drivers that are not installed"""
+    logger.info("Scanning for missing drivers...")
+    
+    # Check if manifest is provided
+    if manifest_path is None:
+        logger.error("Manifest file required for scan action")
+        print("\nError: --manifest parameter is required for scan action")
+        print("Example: python detect-drivers.py --action scan --manifest drivers.json")
+        return None
+    
+    # Check if manifest exists
+    if not manifest_path.exists():
+        logger.error(f"Manifest file not found: {args.manifest}")
+        print(f"\nError: Manifest file not found: {args.manifest}")
+        print("Please provide a reference manifest with --manifest option")
+        return None
+    
+    # Get currently installed drivers
+    installed_drivers = list_installed_drivers()
+    logger.info(f"Found {len(installed_drivers)} installed drivers")
+    
+    # Stream the reference manifest and keep only drivers that are
+    # NOT installed (missing drivers)
+    export_path = args.export or 'drivers-missing.json'
+    results = []
+    seen_drivers = set()
+    reference_count = 0
+    # Index the installed drivers once for all manifest entries
+    installed_index = build_installed_index(installed_drivers)
+    
+    for driver in iter_available_drivers(manifest_path, args.os_filter):
+        reference_count += 1
+        if is_driver_installed(driver, installed_drivers, installed_index):
+            continue
+        
+        driver_name = driver.get('name', 'Unknown Driver')
+        device_id = driver.get('deviceId', '')
+        
+        # Skip duplicates
+        duplicate_key = device_id if device_id else driver_name
+        if duplicate_key in seen_drivers:
+            continue
+        seen_drivers.add(duplicate_key)
+        
+        # Keep driver as-is from manifest (already has URLs, etc.)
+        results.append(driver)
+    
+    if not reference_count:
+        logger.error("Failed to load reference drivers from manifest")
+        print("Error: Could not load drivers from manifest")
+        return None
+    
+    logger.info(f"Loaded {reference_count} reference drivers from manifest")
+    logger.info(f"Found {len(results)} missing drivers")
+    
+    lines = [
+        _SEP_NL,
+        f"Missing Drivers: {len(results)}",
+        _SEP,
+        "Scan complete.",
+        f"  - Reference manifest: {reference_count} drivers",
+        f"  - Currently installed: {len(installed_drivers)} drivers",
+        f"  - Missing (not installed): {len(results)} drivers",
+        "",
+    ]
+    
+    if len(results) == 0:
+        lines += ["All drivers from manifest are already installed!", "No action needed."]
+    else:
+        # Group by manufacturer
+        drivers_by_manufacturer = defaultdict(list)
+        for driver in results:
+            drivers_by_manufacturer[driver.get('manufacturer', driver.get('name', 'Unknown'))].append(driver)
+        manufacturers = sorted(drivers_by_manufacturer)
+        
+        lines.append("Missing drivers by manufacturer:")
+        lines += [f"  - {mfr}: {len(drivers_by_manufacturer[mfr])} driver(s)" for mfr in manufacturers]
+        lines += [
+            "",
+            "Ready for installation:",
+            "  [+] Direct download URLs",
+            "  [+] Installation parameters",
+            "  [+] Ready for automated install",
+            "",
+            "Next steps:",
+            f"  1. python setup-drivers.py --manifest {export_path} --auto-reboot",
+        ]
+    lines.append("")
+    _write_lines(lines)
+    
+    # Export missing drivers
+    if results:
+        try:
+            output_file = Path(export_path)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Group by manufacturer
+            grouped_results = {
+                'manufacturers': [
+                    {'name': mfr, 'drivers': drivers_by_manufacturer[mfr]}
+                    for mfr in manufacturers
+                ]
+            }
+            
+            output_file.write_bytes(_dump_manifest(grouped_results, pretty=args.pretty))
+            
+            logger.info(f"Exported missing drivers to: {export_path}")
+            _write_lines([
+                f"[OK] Missing drivers manifest created: {export_path}",
+                "This file contains only drivers NOT currently installed.",
+            ])
+            
+        except Exception as e:
+            logger.error(f"Failed to export drivers: {e}")
+            print(f"[ERROR] Failed to create manifest: {e}")
+            return None
+    
+    return results
+
+
+ACTIONS = {
+    'available': _handle_available,
+    'installed': _handle_installed,
+    'not-installed': _handle_not_installed,
+    'different-versions': _handle_different_versions,
+    'needing-update': _handle_needing_update,
+    'scan': _handle_scan,
+    'create': _handle_create,
+}
+
 
 def main():
     """Main entry point for driver detection tool"""
@@ -46,9 +564,11 @@ def main():
     parser.add_argument(
         '--action',
         type=str,
-        choices=['available', 'installed', 'not-installed', 'different-versions', 'needing-update', 'scan', 'create'],
+        choices=list(ACTIONS),
         default='needing-update',
-        help='Action to perform. Use "create" to generate new manifest from installed drivers, "scan" to find missing drivers'
+        help='Action to perform. Use "create" to generate new manifest from installed drivers, "scan" to find missing drivers. '
+             'Every action except "available" reuses an installed-driver scan up to '
+             f'{INSTALLED_DRIVERS_CACHE_TTL} seconds old (see --no-cache)'
     )
     
     parser.add_argument(
@@ -64,6 +584,19 @@ def main():
         help='Export results to JSON file at specified path'
     )
     
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent generated manifests for manual editing (default: compact JSON)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rescan installed drivers instead of reusing the cached result of a recent run '
+             f'(kept for {INSTALLED_DRIVERS_CACHE_TTL} seconds)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -75,361 +608,29 @@ def main():
     # Setup logging in logs directory
     setup_logging(log_file='logs/detect-drivers.log', verbose=args.verbose)
     
-    logger.info("=" * 60)
+    logger.info(_SEP)
     logger.info("Driver Detection Tool - Starting")
-    logger.info("=" * 60)
+    logger.info(_SEP)
     logger.info(f"Action: {args.action}")
     if args.manifest:
         logger.info(f"Manifest: {args.manifest}")
     logger.info(f"OS Filter: {args.os_filter or 'None'}")
     
-    # Execute requested action
-    results = []
+    # Handlers parse the manifest on demand; load_drivers_manifest caches the result
+    manifest_path = Path(args.manifest) if args.manifest else None
+    
+    # Refresh the on-disk installed drivers cache; later lookups reuse it
+    if args.no_cache and args.action != 'available':
+        list_installed_drivers(use_cache=False)
     
     try:
-        if args.action == 'available':
-            logger.info("Listing available drivers from manifest...")
-            results = list_available_drivers(args.manifest, args.os_filter)
-            print(f"\n{'='*60}")
-            print(f"Available Drivers: {len(results)}")
-            print(f"{'='*60}")
-            for driver in results:
-                print(f"  - {driver.get('name')} (v{driver.get('version', 'unknown')})")
-                print(f"    OS: {driver.get('os', 'unknown')}, Type: {driver.get('type', 'unknown')}")
-                print(f"    Device ID: {driver.get('deviceId', 'N/A')}")
-                print()
-        
-        elif args.action == 'installed':
-            logger.info("Listing installed drivers...")
-            results = list_installed_drivers()
-            print(f"\n{'='*60}")
-            print(f"Installed Drivers: {len(results)}")
-            print(f"{'='*60}")
-            for driver in results:
-                print(f"  - {driver.get('name')} (v{driver.get('version', 'unknown')})")
-                print(f"    Device ID: {driver.get('deviceId', 'N/A')}")
-                print()
-        
-        elif args.action == 'not-installed':
-            logger.info("Listing drivers not installed...")
-            results = list_not_installed_drivers(args.manifest, args.os_filter)
-            print(f"\n{'='*60}")
-            print(f"Drivers Not Installed: {len(results)}")
-            print(f"{'='*60}")
-            for driver in results:
-                print(f"  - {driver.get('name')} (v{driver.get('version', 'unknown')})")
-                print(f"    OS: {driver.get('os', 'unknown')}, Type: {driver.get('type', 'unknown')}")
-                print(f"    URL: {driver.get('url', 'N/A')}")
-                print()
-        
-        elif args.action == 'different-versions':
-            logger.info("Listing drivers with different versions...")
-            version_diffs = list_drivers_with_different_versions(args.manifest, args.os_filter)
-            print(f"\n{'='*60}")
-            print(f"Drivers with Different Versions: {len(version_diffs)}")
-            print(f"{'='*60}")
-            for available, installed in version_diffs:
-                print(f"  - {available.get('name')}")
-                print(f"    Available: v{available.get('version', 'unknown')}")
-                print(f"    Installed: v{installed.get('version', 'unknown')}")
-                print(f"    URL: {available.get('url', 'N/A')}")
-                print()
-            # For export, convert to list of dicts
-            results = [
-                {
-                    **available,
-                    'installed_version': installed.get('version', 'unknown')
-                }
-                for available, installed in version_diffs
-            ]
-        
-        elif args.action == 'needing-update':
-            logger.info("Listing drivers needing installation or update...")
-            results = list_drivers_needing_update(args.manifest, args.os_filter)
-            print(f"\n{'='*60}")
-            print(f"Drivers Needing Installation/Update: {len(results)}")
-            print(f"{'='*60}")
-            for driver in results:
-                current_ver = driver.get('current_version')
-                if current_ver:
-                    print(f"  - {driver.get('name')} (UPDATE)")
-                    print(f"    Current: v{current_ver}")
-                    print(f"    Available: v{driver.get('version', 'unknown')}")
-                else:
-                    print(f"  - {driver.get('name')} (NEW)")
-                    print(f"    Version: v{driver.get('version', 'unknown')}")
-                print(f"    OS: {driver.get('os', 'unknown')}, Type: {driver.get('type', 'unknown')}")
-                print(f"    URL: {driver.get('url', 'N/A')}")
-                print()
-        
-        elif args.action == 'create':
-            logger.info("Creating new manifest from installed drivers...")
-            
-            # Get currently installed drivers
-            installed_drivers = list_installed_drivers()
-            logger.info(f"Found {len(installed_drivers)} installed drivers")
-            
-            # Process installed drivers and enhance with patterns
-            export_path = args.export or 'drivers.json'
-            results = []
-            seen_drivers = {}  # Track duplicates
-            skipped_count = 0
-            
-            for driver in installed_drivers:
-                driver_name = driver.get('name', 'Unknown Driver')
-                device_id = driver.get('deviceId', '')
-                version = driver.get('version', 'unknown')
-                
-                # Skip generic Windows drivers
-                if is_generic_windows_driver(driver_name):
-                    skipped_count += 1
-                    logger.debug(f"Skipping generic Windows driver: {driver_name}")
-                    continue
-                
-                # Skip duplicates
-                duplicate_key = device_id if device_id else f"{driver_name}_{version}"
-                if duplicate_key in seen_drivers:
-                    skipped_count += 1
-                    logger.debug(f"Skipping duplicate: {driver_name}")
-                    continue
-                
-                seen_drivers[duplicate_key] = True
-                
-                # Get vendor information
-                vendor_info = get_vendor_info(device_id)
-                vendor_name = vendor_info['name'] if vendor_info else 'Unknown Manufacturer'
-                vendor_website = vendor_info['website'] if vendor_info else ''
-                
-                # Detect device type
-                device_type = detect_device_type(driver_name, device_id)
-                
-                # Get download URL suggestion from patterns
-                url_suggestion = suggest_download_url(vendor_name, device_type.lower())
-                suggested_url = ''
-                suggested_notes = ''
-                download_example = ''
-                
-                if url_suggestion and url_suggestion.get('found'):
-                    # Use example URL as template (direct download link)
-                    download_example = url_suggestion.get('example', '')
-                    suggested_url = download_example if download_example else vendor_website
-                    
-                    if url_suggestion.get('notes'):
-                        suggested_notes = url_suggestion['notes']
-                    logger.debug(f"Found download pattern for {vendor_name} {device_type}")
-                else:
-                    # Fallback to vendor website
-                    suggested_url = vendor_website
-                    logger.debug(f"No download pattern for {vendor_name} {device_type}")
-                
-                # Use data from reference manifest if available, enhance with patterns
-                suggested_filename = generate_filename(vendor_name, driver_name, device_type, version)
-                
-                manifest_entry = {
-                    'name': driver_name,
-                    'manufacturer': vendor_name,
-                    'deviceType': device_type,
-                    'version': version,
-                    'deviceId': device_id,
-                    'url': driver.get('url', suggested_url),  # Use manifest URL or suggested
-                    'fileName': driver.get('fileName', suggested_filename),
-                    'sha256': driver.get('sha256', ''),
-                    'type': driver.get('type', 'exe'),
-                    'os': driver.get('os', 'windows' if sys.platform == 'win32' else 'linux'),
-                    'silentArgs': driver.get('silentArgs', '/S /v"/qn"')
-                }
-                
-                # Add notes if available from patterns
-                if suggested_notes and not driver.get('notes'):
-                    manifest_entry['notes'] = suggested_notes
-                
-                results.append(manifest_entry)
-            
-            print(f"\n{'='*60}")
-            print(f"Detected Drivers: {len(results)}")
-            print(f"{'='*60}")
-            print(f"System scan complete.")
-            print(f"  - Found {len(installed_drivers)} total drivers")
-            print(f"  - Skipped {skipped_count} (generic/duplicate drivers)")
-            print(f"  - Included {len(results)} unique hardware drivers")
-            print()
-            
-            # Group drivers by manufacturer
-            drivers_by_manufacturer = {}
-            for driver in results:
-                mfr = driver.get('manufacturer', 'Unknown Manufacturer')
-                if mfr not in drivers_by_manufacturer:
-                    drivers_by_manufacturer[mfr] = []
-                drivers_by_manufacturer[mfr].append(driver)
-            
-            print("Drivers by Manufacturer:")
-            for mfr in sorted(drivers_by_manufacturer.keys()):
-                count = len(drivers_by_manufacturer[mfr])
-                print(f"  - {mfr}: {count} driver(s)")
-            print()
-            
-            # Create grouped structure
-            grouped_results = {
-                'manufacturers': []
-            }
-            
-            for mfr in sorted(drivers_by_manufacturer.keys()):
-                grouped_results['manufacturers'].append({
-                    'name': mfr,
-                    'drivers': drivers_by_manufacturer[mfr]
-                })
-            
-            # Also keep flat structure for compatibility
-            results = grouped_results
-            
-            print("Generated manifest includes:")
-            print("  [+] Manufacturer names")
-            print("  [+] Direct download URLs (where available)")
-            print("  [+] Auto-generated filenames")
-            print("  [+] Device types")
-            print("  [+] Duplicates removed")
-            print()
-            print("Next steps:")
-            print("  1. Review and update URLs/versions as needed")
-            print("  2. Use this as reference: python detect-drivers.py --action scan --manifest drivers.json")
-            print()
-            
-            # Export grouped structure
-            logger.info(f"Exporting detected drivers to: {export_path}")
-            
-            try:
-                output_file = Path(export_path)
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False)
-                
-                logger.info(f"Exported drivers grouped by manufacturer to: {export_path}")
-                print(f"\n[OK] Drivers manifest created: {export_path}")
-                print(f"\nThis file contains all detected hardware drivers.")
-                print(f"Use as reference for future scans!")
-                
-            except Exception as e:
-                logger.error(f"Failed to export drivers: {e}")
-                print(f"[ERROR] Failed to create drivers manifest: {e}")
-                return 1
-        
-        elif args.action == 'scan':
-            logger.info("Scanning for missing drivers...")
-            
-            # Check if manifest is provided
-            if not args.manifest:
-                logger.error("Manifest file required for scan action")
-                print("\nError: --manifest parameter is required for scan action")
-                print("Example: python detect-drivers.py --action scan --manifest drivers.json")
-                return 1
-            
-            # Check if manifest exists
-            if not Path(args.manifest).exists():
-                logger.error(f"Manifest file not found: {args.manifest}")
-                print(f"\nError: Manifest file not found: {args.manifest}")
-                print("Please provide a reference manifest with --manifest option")
-                return 1
-            
-            # Load reference manifest
-            reference_drivers = list_available_drivers(args.manifest, args.os_filter)
-            if not reference_drivers:
-                logger.error("Failed to load reference drivers from manifest")
-                print("Error: Could not load drivers from manifest")
-                return 1
-            
-            logger.info(f"Loaded {len(reference_drivers)} reference drivers from manifest")
-            
-            # Get currently installed drivers
-            installed_drivers = list_installed_drivers()
-            logger.info(f"Found {len(installed_drivers)} installed drivers")
-            
-            # Find drivers that are NOT installed (missing drivers)
-            missing_drivers = list_not_installed_drivers(args.manifest, args.os_filter)
-            logger.info(f"Found {len(missing_drivers)} missing drivers")
-            
-            # Process missing drivers
-            export_path = args.export or 'drivers-missing.json'
-            results = []
-            seen_drivers = {}
-            
-            for driver in missing_drivers:
-                driver_name = driver.get('name', 'Unknown Driver')
-                device_id = driver.get('deviceId', '')
-                
-                # Skip duplicates
-                duplicate_key = device_id if device_id else driver_name
-                if duplicate_key in seen_drivers:
-                    continue
-                seen_drivers[duplicate_key] = True
-                
-                # Keep driver as-is from manifest (already has URLs, etc.)
-                results.append(driver)
-            
-            print(f"\n{'='*60}")
-            print(f"Missing Drivers: {len(results)}")
-            print(f"{'='*60}")
-            print(f"Scan complete.")
-            print(f"  - Reference manifest: {len(reference_drivers)} drivers")
-            print(f"  - Currently installed: {len(installed_drivers)} drivers")
-            print(f"  - Missing (not installed): {len(results)} drivers")
-            print()
-            
-            if len(results) == 0:
-                print("All drivers from manifest are already installed!")
-                print("No action needed.")
-            else:
-                # Group by manufacturer
-                drivers_by_manufacturer = {}
-                for driver in results:
-                    mfr = driver.get('manufacturer', driver.get('name', 'Unknown'))
-                    if mfr not in drivers_by_manufacturer:
-                        drivers_by_manufacturer[mfr] = []
-                    drivers_by_manufacturer[mfr].append(driver)
-                
-                print("Missing drivers by manufacturer:")
-                for mfr in sorted(drivers_by_manufacturer.keys()):
-                    count = len(drivers_by_manufacturer[mfr])
-                    print(f"  - {mfr}: {count} driver(s)")
-                print()
-                
-                print("Ready for installation:")
-                print("  [+] Direct download URLs")
-                print("  [+] Installation parameters")
-                print("  [+] Ready for automated install")
-                print()
-                print("Next steps:")
-                print(f"  1. python setup-drivers.py --manifest {export_path} --auto-reboot")
-            print()
-            
-            # Export missing drivers
-            if results:
-                try:
-                    output_file = Path(export_path)
-                    output_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Group by manufacturer
-                    grouped_results = {'manufacturers': []}
-                    for mfr in sorted(drivers_by_manufacturer.keys()):
-                        grouped_results['manufacturers'].append({
-                            'name': mfr,
-                            'drivers': drivers_by_manufacturer[mfr]
-                        })
-                    
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        json.dump(grouped_results, f, indent=2, ensure_ascii=False)
-                    
-                    logger.info(f"Exported missing drivers to: {export_path}")
-                    print(f"[OK] Missing drivers manifest created: {export_path}")
-                    print(f"This file contains only drivers NOT currently installed.")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to export drivers: {e}")
-                    print(f"[ERROR] Failed to create manifest: {e}")
-                    return 1
+        handler = ACTIONS[args.action]
+        results = handler(args, manifest_path)
+        if results is None:
+            return 1
         
-        # Export if requested
-        if args.export and results:
+        # Export if requested (create and scan already wrote their own manifest)
+        if args.export and results and args.action not in ('create', 'scan'):
             logger.info(f"Exporting results to: {args.export}")
             if export_driver_list(results, args.export):
                 print(f"\nResults exported to: {args.export}")
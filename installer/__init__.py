@@ -8,6 +8,7 @@ __version__ = "1.0.0"
 from installer.core import (
     detect_os,
     install_driver,
+    process_drivers,
     create_manual_note
 )
 
@@ -29,6 +30,7 @@ __all__ = [
     # Core
     'detect_os',
     'install_driver',
+    'process_drivers',
     'create_manual_note',
     # Windows
     'install_exe',
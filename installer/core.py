@@ -2,13 +2,17 @@
 Core installer module with OS detection and driver installation orchestration
 """
 
+import os
 import platform
 import logging
-from typing import Tuple, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, Any, List, Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+_NOTE_SEPARATOR = '=' * 50
+
 
 def detect_os() -> str:
     """
@@ -48,12 +52,135 @@ def install_driver(entry: Dict[str, Any], file_path: str, os_type: str) -> bool:
     
     # Install based on OS and type
     if os_type == 'Windows':
-        return _install_windows_driver(driver_type, file_path, silent_args)
+        success = _install_windows_driver(driver_type, file_path, silent_args)
     elif os_type == 'Linux':
-        return _install_linux_driver(driver_type, file_path)
+        success = _install_linux_driver(driver_type, file_path)
     else:
         logger.error(f"Unsupported OS: {os_type}")
         return False
+    
+    if success:
+        # A cached installed-driver scan no longer reflects the system
+        from utils.driver_detector import invalidate_installed_drivers_cache
+        invalidate_installed_drivers_cache()
+    return success
+
+
+def _download_path(work_dir: str, file_name: str) -> Optional[str]:
+    """
+    Resolve the download path of a manifest fileName inside work_dir
+    
+    Returns:
+        Normalized file path, or None if file_name is empty or does not
+        resolve to a file inside work_dir (e.g. "../x.exe" or an absolute path)
+    """
+    if not file_name:
+        return None
+    base = os.path.abspath(work_dir)
+    file_path = os.path.abspath(os.path.join(base, file_name))
+    try:
+        inside = os.path.commonpath([base, file_path]) == base
+    except ValueError:  # Different drives on Windows
+        inside = False
+    if not inside or file_path == base:
+        return None
+    return file_path
+
+
+def process_drivers(entries: List[Dict[str, Any]], work_dir: str, os_type: str, workers: int = 4,
+                    force: bool = False, dry_run: bool = False) -> List[bool]:
+    """
+    Download, verify and install drivers, overlapping downloads with installs
+    
+    Downloads run on a thread pool while installers run one at a time in
+    manifest order, so a driver installs while the next ones are still
+    downloading. Entries saving to the same file share a single download;
+    entries whose fileName is missing or points outside work_dir are skipped.
+    
+    Args:
+        entries: Manifest entry dictionaries
+        work_dir: Directory to download driver files to
+        os_type: Operating system ('Windows' or 'Linux')
+        workers: Maximum number of simultaneous downloads
+        force: If True, re-download files that already exist
+        dry_run: If True, only log what would be downloaded and installed
+        
+    Returns:
+        List with, for each entry (in order), True if it was installed
+    """
+    from utils.download import download_file
+    from validators.hash_validator import verify_hash
+    
+    results = []
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # Start every download up front; the pool limits how many run at once.
+        # Two downloads into the same file would corrupt each other's .part
+        # file, so entries are deduplicated by target path
+        pending = []
+        downloads = {}
+        for entry in entries:
+            if entry.get('type', '').lower() == 'manual':
+                pending.append((entry, work_dir, None))
+                continue
+            
+            file_path = _download_path(work_dir, entry.get('fileName', '').strip())
+            if file_path is None:
+                logger.error(f"Missing or invalid fileName {entry.get('fileName', '')!r}, skipping: "
+                             f"{entry.get('name', 'Unknown')}")
+                pending.append((entry, None, None))
+                continue
+            
+            if dry_run:
+                pending.append((entry, file_path, None))
+                continue
+            
+            download_key = os.path.normcase(file_path)
+            if download_key in downloads:
+                url, future = downloads[download_key]
+                if url != entry.get('url', ''):
+                    logger.warning(f"{entry.get('name', 'Unknown')} reuses {file_path} downloaded from {url}")
+            else:
+                future = executor.submit(download_file, entry.get('url', ''), file_path, force=force)
+                downloads[download_key] = (entry.get('url', ''), future)
+            pending.append((entry, file_path, future))
+        
+        # Install in manifest order as each download completes
+        for entry, file_path, future in pending:
+            driver_name = entry.get('name', 'Unknown')
+            
+            if file_path is None:
+                results.append(False)
+                continue
+            
+            if dry_run:
+                if entry.get('type', '').lower() == 'manual':
+                    logger.info(f"[DRY-RUN] Would write manual installation note for: {driver_name}")
+                else:
+                    logger.info(f"[DRY-RUN] Would download {entry.get('url', '')} to {file_path} "
+                                f"and install {driver_name}")
+                results.append(True)
+                continue
+            
+            if future is not None:
+                try:
+                    downloaded = future.result()
+                except Exception as e:
+                    logger.error(f"Download raised an error for {driver_name}: {e}")
+                    downloaded = False
+                if not downloaded:
+                    logger.error(f"Download failed, skipping: {driver_name}")
+                    results.append(False)
+                    continue
+            
+            if future is not None and not verify_hash(file_path, entry.get('sha256')):
+                logger.error(f"Hash verification failed, skipping: {driver_name}")
+                results.append(False)
+                continue
+            
+            results.append(install_driver(entry, file_path, os_type))
+    
+    return results
 
 
 def _install_windows_driver(driver_type: str, file_path: str, silent_args: str = None) -> bool:
@@ -104,14 +231,20 @@ def create_manual_note(entry: Dict[str, Any], work_dir: str) -> None:
     
     note_file = Path(work_dir) / f"{driver_name.replace(' ', '_')}.manual.txt"
     
+    content = (
+        f"Manual Installation Required\n"
+        f"{_NOTE_SEPARATOR}\n\n"
+        f"Driver: {driver_name}\n"
+        f"URL: {url}\n"
+        f"Timestamp: {datetime.now().isoformat()}\n\n"
+        f"Please download and install this driver manually.\n"
+    )
+    
     try:
-        with open(note_file, 'w') as f:
-            f.write(f"Manual Installation Required\n")
-            f.write(f"{'=' * 50}\n\n")
-            f.write(f"Driver: {driver_name}\n")
-            f.write(f"URL: {url}\n")
-            f.write(f"Timestamp: {datetime.now().isoformat()}\n\n")
-            f.write(f"Please download and install this driver manually.\n")
+        # Write to a temporary file first so a crash never leaves a partial note
+        tmp_file = note_file.with_suffix('.tmp')
+        tmp_file.write_text(content, encoding='utf-8')
+        os.replace(tmp_file, note_file)
         
         logger.info(f"Created manual installation note: {note_file}")
     except Exception as e:
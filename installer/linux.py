@@ -3,12 +3,37 @@ Linux driver installation module
 Handles installation of deb and rpm packages on Linux
 """
 
+import functools
 import subprocess
 import logging
-from typing import Tuple
+from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+_KNOWN_DISTRIBUTIONS = frozenset(['debian', 'ubuntu', 'fedora', 'arch'])
+
+
+def _run(cmd: List[str]) -> int:
+    """
+    Run a package manager command without a shell
+    
+    Args:
+        cmd: Command and arguments
+        
+    Returns:
+        Exit code of the command (127 if the command is not available)
+    """
+    logger.info(f"Executing: {' '.join(cmd)}")
+    try:
+        # Only stderr is kept, for the log when the command fails
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0 and result.stderr:
+            logger.debug(f"{cmd[0]} stderr: {result.stderr.strip()}")
+        return result.returncode
+    except FileNotFoundError:
+        logger.warning(f"Command not found: {cmd[0]}")
+        return 127
+
 
 def install_deb(file_path: str) -> Tuple[bool, int]:
     """
@@ -22,26 +47,22 @@ def install_deb(file_path: str) -> Tuple[bool, int]:
     """
     try:
         # Try dpkg first
-        cmd = f'dpkg -i "{file_path}"'
-        logger.info(f"Executing: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        returncode = _run(['dpkg', '-i', file_path])
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("DEB installation successful")
-            return True, result.returncode
+            return True, returncode
         
         # If dpkg fails, try apt
         logger.warning("dpkg failed, trying apt install")
-        cmd = f'apt install -y "{file_path}"'
-        logger.info(f"Executing: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        returncode = _run(['apt', 'install', '-y', file_path])
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("DEB installation successful via apt")
-            return True, result.returncode
+            return True, returncode
         else:
-            logger.error(f"DEB installation failed with exit code: {result.returncode}")
-            return False, result.returncode
+            logger.error(f"DEB installation failed with exit code: {returncode}")
+            return False, returncode
             
     except Exception as e:
         logger.error(f"Error during DEB installation: {e}")
@@ -60,63 +81,64 @@ def install_rpm(file_path: str) -> Tuple[bool, int]:
     """
     try:
         # Try rpm first
-        cmd = f'rpm -i "{file_path}"'
-        logger.info(f"Executing: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        returncode = _run(['rpm', '-i', file_path])
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("RPM installation successful")
-            return True, result.returncode
+            return True, returncode
         
         # If rpm fails, try dnf
         logger.warning("rpm failed, trying dnf install")
-        cmd = f'dnf install -y "{file_path}"'
-        logger.info(f"Executing: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        returncode = _run(['dnf', 'install', '-y', file_path])
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("RPM installation successful via dnf")
-            return True, result.returncode
+            return True, returncode
         
         # If dnf fails, try yum
         logger.warning("dnf failed, trying yum install")
-        cmd = f'yum install -y "{file_path}"'
-        logger.info(f"Executing: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        returncode = _run(['yum', 'install', '-y', file_path])
         
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("RPM installation successful via yum")
-            return True, result.returncode
+            return True, returncode
         else:
-            logger.error(f"RPM installation failed with exit code: {result.returncode}")
-            return False, result.returncode
+            logger.error(f"RPM installation failed with exit code: {returncode}")
+            return False, returncode
             
     except Exception as e:
         logger.error(f"Error during RPM installation: {e}")
         return False, -1
 
 
+@functools.lru_cache(maxsize=1)
 def detect_distribution() -> str:
     """
     Detect Linux distribution
     
+    The result is cached, /etc/os-release does not change during a run.
+    
     Returns:
         Distribution name (debian, ubuntu, fedora, arch, unknown)
     """
     try:
+        id_like = None
         with open('/etc/os-release', 'r') as f:
-            content = f.read().lower()
-            
-        if 'debian' in content:
-            return 'debian'
-        elif 'ubuntu' in content:
-            return 'ubuntu'
-        elif 'fedora' in content:
-            return 'fedora'
-        elif 'arch' in content:
-            return 'arch'
-        else:
-            return 'unknown'
+            for line in f:
+                key, _, value = line.partition('=')
+                if key == 'ID':
+                    # The distribution itself wins, stop reading here
+                    name = value.strip().strip('"\'').lower()
+                    if name in _KNOWN_DISTRIBUTIONS:
+                        return name
+                elif key == 'ID_LIKE':
+                    id_like = value.strip().strip('"\'').lower()
+        
+        # Otherwise fall back to the distributions it is derived from
+        for name in (id_like or '').split():
+            if name in _KNOWN_DISTRIBUTIONS:
+                return name
+        return 'unknown'
     except Exception as e:
         logger.warning(f"Failed to detect distribution: {e}")
         return 'unknown'
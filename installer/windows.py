@@ -3,13 +3,70 @@ Windows driver installation module
 Handles installation of exe, msi, and zip drivers on Windows
 """
 
+import os
+import json
 import subprocess
 import logging
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Exit codes: 0 = success, 3010 = success with reboot required, 1641 = success with reboot initiated
+_SUCCESS_CODES = frozenset((0, 3010, 1641))
+
+# Common silent arguments, tried in order after the known and manifest ones
+_SILENT_ARGS_DEFAULTS = (
+    '/S',
+    '/silent',
+    '/quiet',
+    '/verysilent',
+    '/s',
+    '/s /v"/qn"',
+    '/S /v"/qn"',
+)
+
+# Silent arguments that worked for an installer, kept between runs so a
+# reinstall does not go through the trial-and-error loop again
+SILENT_ARGS_CACHE = Path.home() / '.cache' / 'b590m-plus' / 'silent-args.json'
+
+_known_silent_args = None  # Loaded from SILENT_ARGS_CACHE on first use
+
+
+def _installer_key(file_path: str) -> Optional[str]:
+    """Identify an installer by file name and size, or None if it cannot be read"""
+    try:
+        return f"{os.path.basename(file_path).lower()}:{os.path.getsize(file_path)}"
+    except OSError:
+        return None
+
+
+def _load_silent_args() -> Dict[str, str]:
+    """Return the remembered silent arguments, reading the cache file once"""
+    global _known_silent_args
+    if _known_silent_args is None:
+        try:
+            data = json.loads(SILENT_ARGS_CACHE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = {}
+        _known_silent_args = data if isinstance(data, dict) else {}
+    return _known_silent_args
+
+
+def _remember_silent_args(installer_key: str, args: str) -> None:
+    """Record the silent arguments that worked and atomically update the cache file"""
+    known = _load_silent_args()
+    if known.get(installer_key) == args:
+        return
+    known[installer_key] = args
+    try:
+        SILENT_ARGS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = SILENT_ARGS_CACHE.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(known), encoding='utf-8')
+        os.replace(tmp_file, SILENT_ARGS_CACHE)
+    except OSError as e:
+        logger.debug(f"Could not write silent arguments cache: {e}")
+
 
 def install_exe(file_path: str, silent_args: Optional[str] = None) -> Tuple[bool, int]:
     """
@@ -22,32 +79,34 @@ def install_exe(file_path: str, silent_args: Optional[str] = None) -> Tuple[bool
     Returns:
         Tuple of (success: bool, exit_code: int)
     """
-    # List of silent arguments to try in order
-    silent_args_list = [
-        silent_args,  # Custom args from manifest
-        '/S',
-        '/silent',
-        '/quiet',
-        '/verysilent',
-        '/s',
-        '/s /v"/qn"',
-        '/S /v"/qn"'
-    ]
+    installer_key = _installer_key(file_path)
+    known_args = _load_silent_args().get(installer_key) if installer_key else None
     
+    # Args that worked for this installer before, then custom args from manifest
+    silent_args_list = (known_args, silent_args) + _SILENT_ARGS_DEFAULTS
+    
+    tried = set()
     for args in silent_args_list:
-        if args is None:
+        if args is None or args in tried:
             continue
-            
+        tried.add(args)
+        
         try:
             logger.info(f"Attempting installation with args: {args}")
+            # CreateProcess takes the command line as-is, so no cmd.exe is needed
+            # and vendor quoting such as /v"/qn" reaches the installer untouched
             cmd = f'"{file_path}" {args}'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
             
-            if result.returncode == 0 or result.returncode == 3010 or result.returncode == 1641:
+            if result.returncode in _SUCCESS_CODES:
                 logger.info(f"Installation successful with exit code: {result.returncode}")
+                if installer_key:
+                    _remember_silent_args(installer_key, args)
                 return True, result.returncode
             else:
                 logger.warning(f"Installation failed with exit code: {result.returncode}")
+                if result.stderr:
+                    logger.debug(f"Installer stderr: {result.stderr.strip()}")
         except Exception as e:
             logger.error(f"Error during installation: {e}")
             continue
@@ -55,7 +114,7 @@ def install_exe(file_path: str, silent_args: Optional[str] = None) -> Tuple[bool
     # If all silent attempts fail, try without arguments
     logger.warning("All silent installation attempts failed, running without arguments")
     try:
-        result = subprocess.run(f'"{file_path}"', shell=True)
+        result = subprocess.run([file_path])
         return False, result.returncode
     except Exception as e:
         logger.error(f"Final installation attempt failed: {e}")
@@ -73,22 +132,42 @@ def install_msi(file_path: str) -> Tuple[bool, int]:
         Tuple of (success: bool, exit_code: int)
     """
     try:
-        cmd = f'msiexec.exe /i "{file_path}" /qn /norestart'
-        logger.info(f"Executing: {cmd}")
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        cmd = ['msiexec.exe', '/i', file_path, '/qn', '/norestart']
+        logger.info(f"Executing: {subprocess.list2cmdline(cmd)}")
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         
-        # Exit codes: 0 = success, 3010 = success with reboot required, 1641 = success with reboot initiated
-        if result.returncode in [0, 3010, 1641]:
+        if result.returncode in _SUCCESS_CODES:
             logger.info(f"MSI installation successful with exit code: {result.returncode}")
             return True, result.returncode
         else:
             logger.error(f"MSI installation failed with exit code: {result.returncode}")
+            if result.stderr:
+                logger.debug(f"msiexec stderr: {result.stderr.strip()}")
             return False, result.returncode
     except Exception as e:
         logger.error(f"Error during MSI installation: {e}")
         return False, -1
 
 
+def _choose_installer_member(members: list):
+    """
+    Pick the installer to run from the members of a ZIP archive
+    
+    Args:
+        members: ZipInfo entries of the archive
+        
+    Returns:
+        The shallowest exe or msi entry (alphabetical on ties), or None
+    """
+    installers = [
+        info for info in members
+        if not info.is_dir() and info.filename.rpartition('.')[2].lower() in ('exe', 'msi')
+    ]
+    if not installers:
+        return None
+    return min(installers, key=lambda info: (info.filename.count('/'), info.filename))
+
+
 def install_zip(file_path: str) -> Tuple[bool, int]:
     """
     Extract ZIP and install the installer found inside
@@ -109,29 +188,37 @@ def install_zip(file_path: str) -> Tuple[bool, int]:
         temp_dir = tempfile.mkdtemp()
         logger.info(f"Extracting ZIP to: {temp_dir}")
         
-        # Extract ZIP
         with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-        
-        # Search for installers (exe or msi)
-        temp_path = Path(temp_dir)
-        installers = sorted(list(temp_path.rglob('*.exe')) + list(temp_path.rglob('*.msi')))
-        
-        if not installers:
-            logger.error(f"No installer found inside ZIP: {file_path}")
-            return False, -1
+            # Pick the installer (exe or msi) from the central directory
+            members = zip_ref.infolist()
+            chosen = _choose_installer_member(members)
+            
+            if chosen is None:
+                logger.error(f"No installer found inside ZIP: {file_path}")
+                return False, -1
+            
+            # Extract only the installer's folder, it may need its sibling files
+            installer_dir = chosen.filename.rpartition('/')[0]
+            prefix = installer_dir + '/' if installer_dir else ''
+            extracted = 0
+            for info in members:
+                if info.filename.startswith(prefix):
+                    target = zip_ref.extract(info, temp_dir)
+                    extracted += 1
+                    if info is chosen:
+                        installer = target
+            logger.info(f"Extracted {extracted} of {len(members)} ZIP entries")
         
-        # Use first installer found
-        installer = installers[0]
         logger.info(f"Found installer: {installer}")
         
         # Install based on extension
-        if installer.suffix.lower() == '.exe':
-            return install_exe(str(installer))
-        elif installer.suffix.lower() == '.msi':
-            return install_msi(str(installer))
+        extension = installer.rpartition('.')[2].lower()
+        if extension == 'exe':
+            return install_exe(installer)
+        elif extension == 'msi':
+            return install_msi(installer)
         else:
-            logger.error(f"Unknown installer type: {installer.suffix}")
+            logger.error(f"Unknown installer type: .{extension}")
             return False, -1
             
     except Exception as e:
@@ -8,11 +8,16 @@ import sys
 import logging
 from pathlib import Path
 
-from utils.logging_config import setup_logging, log_system_info
-from utils.init_validator import create_argument_parser, validate_environment
+from utils.logging_config import setup_logging, log_system_info, log_summary
+from utils.init_validator import create_argument_parser, validate_environment, detect_os
+from utils.file_utils import ensure_directory
+from utils.driver_detector import load_drivers_manifest
+from installer.core import process_drivers
 
 logger = logging.getLogger(__name__)
 
+WORK_DIR = 'downloads_work'
+
 
 def main():
     """Main entry point for the driver installer"""
@@ -44,11 +49,27 @@ def main():
     logger.info(f"  Dry-run: {args.dry_run}")
     logger.info(f"  Verbose: {args.verbose}")
     
-    # TODO: Implement driver processing logic in subsequent tasks
     logger.info("Initialization completed successfully")
-    logger.info("Ready to process drivers (implementation pending)")
     
-    return 0
+    drivers = load_drivers_manifest(args.manifest)
+    if drivers is None:
+        logger.error(f"Could not load manifest: {args.manifest}")
+        return 1
+    
+    # Keep only the entries meant for this operating system
+    os_type = detect_os()
+    entries = [d for d in drivers if d.get('os', os_type).lower() == os_type.lower()]
+    logger.info(f"{len(entries)} of {len(drivers)} manifest entries apply to {os_type}")
+    
+    if not args.dry_run:
+        ensure_directory(WORK_DIR)
+    
+    results = process_drivers(entries, WORK_DIR, os_type, force=args.force, dry_run=args.dry_run)
+    
+    successful = sum(1 for installed in results if installed)
+    log_summary(len(results), successful, len(results) - successful)
+    
+    return 0 if successful == len(results) else 1
 
 
 if __name__ == "__main__":
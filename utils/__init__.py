@@ -1,54 +1,71 @@
 """
 Utility module for common helper functions
+
+Submodules are imported on first attribute access (PEP 562), so importing
+one utility does not pull in requests and the detection code.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 
-# Download utilities
-from utils.download import (
-    download_file,
-    download_with_progress_bar
-)
+# Public name -> submodule that defines it
+_LAZY = {
+    # Download utilities
+    'download_file': 'utils.download',
+    'download_file_parallel': 'utils.download',
+    'download_many': 'utils.download',
+    'download_many_async': 'utils.download',
+    'download_with_progress_bar': 'utils.download',
+    # File utilities
+    'ensure_directory': 'utils.file_utils',
+    'file_exists': 'utils.file_utils',
+    'get_file_size': 'utils.file_utils',
+    'cleanup_temp_files': 'utils.file_utils',
+    # Logging utilities
+    'setup_logging': 'utils.logging_config',
+    'log_system_info': 'utils.logging_config',
+    'log_summary': 'utils.logging_config',
+    # Initialization and validation utilities
+    'check_python_version': 'utils.init_validator',
+    'check_dependencies': 'utils.init_validator',
+    'detect_os': 'utils.init_validator',
+    'check_admin_privileges': 'utils.init_validator',
+    'create_argument_parser': 'utils.init_validator',
+    'validate_environment': 'utils.init_validator',
+    # Driver detection utilities
+    'load_drivers_manifest': 'utils.driver_detector',
+    'list_available_drivers': 'utils.driver_detector',
+    'list_installed_drivers': 'utils.driver_detector',
+    'list_not_installed_drivers': 'utils.driver_detector',
+    'list_drivers_with_different_versions': 'utils.driver_detector',
+    'list_drivers_needing_update': 'utils.driver_detector',
+    'export_driver_list': 'utils.driver_detector',
+    'invalidate_installed_drivers_cache': 'utils.driver_detector',
+}
+
 
-# File utilities
-from utils.file_utils import (
-    ensure_directory,
-    file_exists,
-    get_file_size,
-    cleanup_temp_files
-)
+def __getattr__(name):
+    """Import the submodule defining name on first access and cache the result"""
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
-# Logging utilities
-from utils.logging_config import (
-    setup_logging,
-    log_system_info,
-    log_summary
-)
 
-# Initialization and validation utilities
-from utils.init_validator import (
-    check_python_version,
-    check_dependencies,
-    detect_os,
-    check_admin_privileges,
-    create_argument_parser,
-    validate_environment
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
-# Driver detection utilities
-from utils.driver_detector import (
-    load_drivers_manifest,
-    list_available_drivers,
-    list_installed_drivers,
-    list_not_installed_drivers,
-    list_drivers_with_different_versions,
-    list_drivers_needing_update,
-    export_driver_list
-)
 
 __all__ = [
     # Download
     'download_file',
+    'download_file_parallel',
+    'download_many',
+    'download_many_async',
     'download_with_progress_bar',
     # File utilities
     'ensure_directory',
@@ -74,4 +91,5 @@ __all__ = [
     'list_drivers_with_different_versions',
     'list_drivers_needing_update',
     'export_driver_list',
+    'invalidate_installed_drivers_cache',
 ]
@@ -2,16 +2,252 @@
 Download utilities with retry logic and progress tracking
 """
 
+import asyncio
+import os
+import json
 import requests
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # Optional HTTP/2 backend for download_many
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError:  # Optional backend for download_many_async
+    aiohttp = None
 
 logger = logging.getLogger(__name__)
 
+# Read/write size for streamed downloads and how often progress is logged
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PROGRESS_LOG_STEP = 10 * 1024 * 1024
+
+# Headers sent by every download client. Drivers are already compressed
+# archives/installers, so ask for them as-is: gzip would only cost CPU on
+# both ends, and sizes and byte ranges then refer to the file itself.
+_DOWNLOAD_HEADERS = {
+    'User-Agent': 'asus-b590m-plus/1.0.0',
+    'Accept-Encoding': 'identity',
+}
+
+# Shared session so retries and later downloads reuse open connections.
+# Adapter retries are off, the download functions do their own backoff.
+_POOL_SIZE = 16
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE, max_retries=0))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE, max_retries=0))
+_SESSION.headers.update(_DOWNLOAD_HEADERS)
+_SESSION.headers['Connection'] = 'keep-alive'
+
+# HTTP/2 client shared by download_many when httpx (with h2) is installed,
+# multiplexing concurrent downloads from one host over a single connection
+_http2_client = None
+_http2_lock = threading.Lock()
+
+
+def _meta_path(output_path: str) -> Path:
+    """Sidecar file holding the validators of a completed download"""
+    return Path(f"{output_path}.meta.json")
+
+
+def _write_download_meta(output_path: str, response: requests.Response) -> None:
+    """Record ETag, Last-Modified and size of a completed download next to the file"""
+    meta = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'size': os.path.getsize(output_path),
+    }
+    try:
+        _meta_path(output_path).write_text(json.dumps(meta), encoding='utf-8')
+    except OSError as e:
+        logger.debug(f"Could not write download metadata for {output_path}: {e}")
+
+
+def _cached_file_is_current(url: str, output_path: str, session: requests.Session) -> bool:
+    """
+    Check whether an existing download can be reused
+    
+    A HEAD request revalidates the file against the server. When the sidecar
+    of a completed download matches the file, its ETag/Last-Modified are sent
+    as If-None-Match/If-Modified-Since, and a 304 or an unchanged ETag keeps
+    the file. Without an ETag to compare, a changed Last-Modified discards
+    it. The server's Content-Length must also match the local size, which
+    catches files left truncated by an interrupted run.
+    
+    Args:
+        url: URL the file was downloaded from
+        output_path: Local path of the existing file
+        session: Session to send the HEAD request through
+        
+    Returns:
+        True if the file can be used as-is, False if it must be downloaded again
+    """
+    size = os.path.getsize(output_path)
+    meta = {}
+    try:
+        meta = json.loads(_meta_path(output_path).read_text(encoding='utf-8'))
+        if not isinstance(meta, dict) or meta.get('size') != size:
+            meta = {}
+    except (OSError, ValueError):
+        pass
+    
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    
+    try:
+        response = session.head(url, timeout=30, allow_redirects=True, headers=headers)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        # Cannot check against the server, keep using the local file
+        logger.debug(f"HEAD request failed for {url}: {e}")
+        return True
+    
+    if response.status_code == 304:
+        return True
+    
+    remote_etag = response.headers.get('ETag')
+    if meta.get('etag') and remote_etag and remote_etag != meta['etag']:
+        logger.info(f"Cached file changed on the server (ETag {meta['etag']} -> {remote_etag}): {output_path}")
+        return False
+    
+    # If-None-Match takes precedence over If-Modified-Since, so only fall back
+    # to Last-Modified when the ETag could not confirm the file
+    etag_matched = bool(meta.get('etag')) and remote_etag == meta['etag']
+    remote_modified = response.headers.get('Last-Modified')
+    if (not etag_matched and meta.get('last_modified') and remote_modified
+            and remote_modified != meta['last_modified']):
+        logger.info(f"Cached file changed on the server (Last-Modified {meta['last_modified']} -> "
+                    f"{remote_modified}): {output_path}")
+        return False
+    
+    remote_size = response.headers.get('content-length')
+    if remote_size is None or not remote_size.isdigit() or response.headers.get('content-encoding'):
+        return True
+    if int(remote_size) == size:
+        if not meta:
+            _write_download_meta(output_path, response)
+        return True
+    
+    logger.info(f"Cached file is incomplete or outdated ({size} of {remote_size} bytes): {output_path}")
+    return False
+
+
+def _discard_partial(output_path: str) -> None:
+    """Remove a partial download and its metadata"""
+    part_path = f"{output_path}.part"
+    for path in (part_path, str(_meta_path(part_path))):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _open_resumable(url: str, output_path: str, timeout: int,
+                    session: requests.Session) -> Tuple[requests.Response, str, int]:
+    """
+    Request a download, continuing a previous partial download when possible
+    
+    Data is written to {output_path}.part. When that file exists and the
+    validator (ETag or Last-Modified) of the response that created it is
+    known, a Range request asks only for the missing bytes; If-Range makes
+    the server send the whole file instead if it changed in the meantime.
+    
+    Args:
+        url: URL to download from
+        output_path: Final local path of the file
+        timeout: Timeout in seconds for the request
+        session: Session to send the request through
+        
+    Returns:
+        Tuple of (response, mode to open the part file with, bytes already downloaded)
+    """
+    part_path = f"{output_path}.part"
+    part_meta = _meta_path(part_path)
+    
+    try:
+        resume_from = os.path.getsize(part_path)
+        meta = json.loads(part_meta.read_text(encoding='utf-8'))
+        validator = meta.get('validator')
+    except (OSError, ValueError, AttributeError):
+        resume_from, validator = 0, None
+    
+    response = None
+    if resume_from and validator:
+        headers = {'Range': f"bytes={resume_from}-", 'If-Range': validator}
+        response = session.get(url, timeout=timeout, stream=True, headers=headers)
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code == 206 and content_range.startswith(f"bytes {resume_from}-"):
+            logger.info(f"Resuming download at byte {resume_from}")
+            return response, 'ab', resume_from
+        if response.status_code != 200:
+            # Range not satisfiable or unexpected answer, start over
+            response.close()
+            response = None
+    
+    if response is None:
+        response = session.get(url, timeout=timeout, stream=True)
+    response.raise_for_status()
+    
+    # Full response: remember its validator so an interrupted download can resume.
+    # Weak ETags cannot be used with If-Range, Last-Modified is used instead.
+    etag = response.headers.get('ETag')
+    if etag and etag.startswith('W/'):
+        etag = None
+    try:
+        part_meta.write_text(
+            json.dumps({'validator': etag or response.headers.get('Last-Modified')}),
+            encoding='utf-8'
+        )
+    except OSError as e:
+        logger.debug(f"Could not write partial download metadata for {output_path}: {e}")
+    return response, 'wb', 0
+
 
-def download_file(url: str, output_path: str, max_retries: int = 3, timeout: int = 600, force: bool = False) -> bool:
+def _open_part_fd(output_path: str, mode: str) -> int:
+    """Open the part file for unbuffered writes ('ab' appends, 'wb' truncates)"""
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+    flags |= os.O_APPEND if mode == 'ab' else os.O_TRUNC
+    return os.open(f"{output_path}.part", flags, 0o644)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write data to a raw file descriptor, retrying short writes"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _ensure_output_dir(output_path: str) -> bool:
+    """Create the directory of output_path once before the download attempts"""
+    try:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        return True
+    except OSError as e:
+        logger.error(f"Cannot create output directory for {output_path}: {e}")
+        return False
+
+
+def _finish_download(output_path: str, response: requests.Response) -> None:
+    """Move a completed partial download into place and record its metadata"""
+    os.replace(f"{output_path}.part", output_path)
+    _discard_partial(output_path)
+    _write_download_meta(output_path, response)
+
+
+def download_file(url: str, output_path: str, max_retries: int = 3, timeout: int = 600, force: bool = False,
+                  session: Optional[requests.Session] = None, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> bool:
     """
     Download file from URL with retry logic and cache support
     
@@ -21,50 +257,63 @@ def download_file(url: str, output_path: str, max_retries: int = 3, timeout: int
         max_retries: Maximum number of retry attempts
         timeout: Timeout in seconds for each attempt
         force: If True, re-download even if file exists (default: False)
+        session: Session to send the request through (default: shared module session)
+        chunk_size: Bytes read and written per iteration (default: 1 MiB)
         
     Returns:
         True if download successful, False otherwise
     """
     # Check if file already exists (cache support)
-    output_file = Path(output_path)
-    if output_file.exists() and not force:
+    file_exists = os.path.exists(output_path)
+    if file_exists and not force and _cached_file_is_current(url, output_path, session or _SESSION):
         logger.info(f"File already exists, using cached version: {output_path}")
         logger.info(f"Use force=True to re-download")
         return True
     
-    if output_file.exists() and force:
+    if file_exists and force:
         logger.info(f"Force flag enabled, re-downloading: {output_path}")
+    if force:
+        _discard_partial(output_path)
+    
+    if not _ensure_output_dir(output_path):
+        return False
     
     for attempt in range(1, max_retries + 1):
         try:
             logger.info(f"Downloading from {url} (attempt {attempt}/{max_retries})")
             
-            # Make request with timeout
-            response = requests.get(url, timeout=timeout, stream=True)
-            response.raise_for_status()
+            # Make request with timeout, resuming a partial download if possible
+            response, mode, downloaded = _open_resumable(url, output_path, timeout, session or _SESSION)
             
             # Get file size if available
             total_size = int(response.headers.get('content-length', 0))
+            if total_size:
+                total_size += downloaded
             
-            # Ensure output directory exists
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+            # Log progress each time the next 10MB boundary is reached
+            next_log_at = (downloaded // PROGRESS_LOG_STEP + 1) * PROGRESS_LOG_STEP
             
-            with open(output_path, 'wb') as f:
-                if total_size == 0:
-                    # No content-length header
-                    f.write(response.content)
-                else:
-                    downloaded = 0
-                    chunk_size = 8192
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            # Log progress every 10MB
-                            if downloaded % (10 * 1024 * 1024) < chunk_size:
-                                progress = (downloaded / total_size) * 100 if total_size > 0 else 0
+            # Chunks are already large, write them straight to the fd without
+            # another copy through a buffered file object. Reading into a reused
+            # buffer with response.raw.readinto would not save the allocation:
+            # urllib3 implements readinto as read() plus a copy into the buffer.
+            fd = _open_part_fd(output_path, mode)
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        _write_all(fd, chunk)
+                        downloaded += len(chunk)
+                        if downloaded >= next_log_at:
+                            if total_size:
+                                progress = (downloaded / total_size) * 100
                                 logger.info(f"Progress: {progress:.1f}% ({downloaded}/{total_size} bytes)")
+                            else:
+                                logger.info(f"Progress: {downloaded} bytes (total size unknown)")
+                            next_log_at = (downloaded // PROGRESS_LOG_STEP + 1) * PROGRESS_LOG_STEP
+            finally:
+                os.close(fd)
             
+            _finish_download(output_path, response)
             logger.info(f"Download completed: {output_path}")
             return True
             
@@ -88,7 +337,331 @@ def download_file(url: str, output_path: str, max_retries: int = 3, timeout: int
     return False
 
 
-def download_with_progress_bar(url: str, output_path: str, max_retries: int = 3, timeout: int = 600, force: bool = False) -> bool:
+def _get_http2_client():
+    """Return the shared HTTP/2 client, or None if httpx/h2 are not installed"""
+    global _http2_client
+    
+    if httpx is None:
+        return None
+    with _http2_lock:
+        if _http2_client is None:
+            try:
+                _http2_client = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    headers=_DOWNLOAD_HEADERS,
+                    limits=httpx.Limits(max_keepalive_connections=_POOL_SIZE, max_connections=2 * _POOL_SIZE),
+                )
+            except ImportError:
+                # httpx is installed without the h2 extra
+                logger.debug("h2 not available, using requests for concurrent downloads")
+                return None
+        return _http2_client
+
+
+def _download_file_http2(client, url: str, output_path: str, max_retries: int = 3, timeout: int = 600,
+                         force: bool = False) -> bool:
+    """
+    Download file over the shared HTTP/2 client with retry logic and cache support
+    
+    Args:
+        client: httpx client to send the request through
+        url: URL to download from
+        output_path: Local path to save file
+        max_retries: Maximum number of retry attempts
+        timeout: Timeout in seconds for each attempt
+        force: If True, re-download even if file exists (default: False)
+        
+    Returns:
+        True if download successful, False otherwise
+    """
+    if os.path.exists(output_path) and not force and _cached_file_is_current(url, output_path, _SESSION):
+        logger.info(f"File already exists, using cached version: {output_path}")
+        return True
+    
+    if not _ensure_output_dir(output_path):
+        return False
+    
+    for attempt in range(1, max_retries + 1):
+        try:
+            logger.info(f"Downloading from {url} over HTTP/2 (attempt {attempt}/{max_retries})")
+            
+            with client.stream('GET', url, timeout=timeout) as response:
+                response.raise_for_status()
+                fd = _open_part_fd(output_path, 'wb')
+                try:
+                    for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        _write_all(fd, chunk)
+                finally:
+                    os.close(fd)
+            
+            _finish_download(output_path, response)
+            logger.info(f"Download completed: {output_path}")
+            return True
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Download error on attempt {attempt}: {e}")
+            if attempt < max_retries:
+                wait_time = 2 ** (attempt - 1)
+                logger.info(f"Retrying in {wait_time} seconds...")
+                time.sleep(wait_time)
+        except Exception as e:
+            logger.error(f"Unexpected error during download: {e}")
+            return False
+    
+    logger.error(f"Download failed after {max_retries} attempts")
+    return False
+
+
+def download_many(jobs: List[Tuple[str, str]], workers: int = 8, max_retries: int = 3, timeout: int = 600,
+                  force: bool = False) -> Dict[str, bool]:
+    """
+    Download several files concurrently
+    
+    Downloads are I/O bound, so they run on a thread pool sharing the
+    module session; connections to the same host are reused between files.
+    When httpx with HTTP/2 support is installed, the downloads are
+    multiplexed over a shared HTTP/2 client instead.
+    
+    Args:
+        jobs: List of (url, output_path) pairs
+        workers: Maximum number of simultaneous downloads
+        max_retries: Maximum number of retry attempts per file
+        timeout: Timeout in seconds for each attempt
+        force: If True, re-download even if files exist (default: False)
+        
+    Returns:
+        Dictionary mapping each output_path to True if its download succeeded
+    """
+    if not jobs:
+        return {}
+    
+    # More workers than pooled connections would only open throwaway connections
+    workers = max(1, min(workers, len(jobs), _POOL_SIZE))
+    
+    client = _get_http2_client()
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if client is not None:
+            futures = {
+                output_path: executor.submit(_download_file_http2, client, url, output_path, max_retries, timeout, force)
+                for url, output_path in jobs
+            }
+        else:
+            futures = {
+                output_path: executor.submit(download_file, url, output_path, max_retries, timeout, force)
+                for url, output_path in jobs
+            }
+        return {output_path: future.result() for output_path, future in futures.items()}
+
+
+async def _download_file_async(session, url: str, output_path: str, max_retries: int, timeout: int,
+                               force: bool) -> bool:
+    """
+    Download file over an aiohttp session with retry logic and cache support
+    
+    Blocking work (the cache check and disk writes) runs in the default
+    executor so the event loop keeps serving the other downloads.
+    
+    Returns:
+        True if download successful, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    
+    if os.path.exists(output_path) and not force and await loop.run_in_executor(
+            None, _cached_file_is_current, url, output_path, _SESSION):
+        logger.info(f"File already exists, using cached version: {output_path}")
+        return True
+    
+    if not _ensure_output_dir(output_path):
+        return False
+    
+    for attempt in range(1, max_retries + 1):
+        try:
+            logger.info(f"Downloading from {url} (attempt {attempt}/{max_retries})")
+            
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                fd = _open_part_fd(output_path, 'wb')
+                try:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await loop.run_in_executor(None, _write_all, fd, chunk)
+                finally:
+                    os.close(fd)
+            
+            _finish_download(output_path, response)
+            logger.info(f"Download completed: {output_path}")
+            return True
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Download error on attempt {attempt}: {str(e) or type(e).__name__}")
+            if attempt < max_retries:
+                wait_time = 2 ** (attempt - 1)
+                logger.info(f"Retrying in {wait_time} seconds...")
+                await asyncio.sleep(wait_time)
+        except Exception as e:
+            logger.error(f"Unexpected error during download: {e}")
+            return False
+    
+    logger.error(f"Download failed after {max_retries} attempts")
+    return False
+
+
+async def download_many_async(jobs: List[Tuple[str, str]], workers: int = 8, max_retries: int = 3,
+                              timeout: int = 600, force: bool = False) -> Dict[str, bool]:
+    """
+    Download several files concurrently from a running event loop
+    
+    With aiohttp installed all downloads share one client session limited
+    to `workers` connections (4 per host). Without it, download_many runs
+    in the loop's default executor.
+    
+    Args:
+        jobs: List of (url, output_path) pairs
+        workers: Maximum number of simultaneous downloads
+        max_retries: Maximum number of retry attempts per file
+        timeout: Timeout in seconds for each attempt
+        force: If True, re-download even if files exist (default: False)
+        
+    Returns:
+        Dictionary mapping each output_path to True if its download succeeded
+    """
+    if not jobs:
+        return {}
+    
+    if aiohttp is None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, download_many, jobs, workers, max_retries, timeout, force)
+    
+    connector = aiohttp.TCPConnector(limit=max(1, workers), limit_per_host=4)
+    async with aiohttp.ClientSession(connector=connector,
+                                     headers=_DOWNLOAD_HEADERS) as session:
+        results = await asyncio.gather(*(
+            _download_file_async(session, url, output_path, max_retries, timeout, force)
+            for url, output_path in jobs
+        ))
+    return {output_path: ok for (_, output_path), ok in zip(jobs, results)}
+
+
+def _download_piece(url: str, part_path: str, start: int, end: int, validator: Optional[str],
+                    max_retries: int, timeout: int) -> bool:
+    """
+    Download one byte range of a file into its place in a preallocated part file
+    
+    Returns:
+        True if the whole range was written, False otherwise
+    """
+    headers = {'Range': f"bytes={start}-{end}"}
+    if validator:
+        headers['If-Range'] = validator
+    
+    for attempt in range(1, max_retries + 1):
+        try:
+            with _SESSION.get(url, headers=headers, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                if response.status_code != 206 or not response.headers.get('Content-Range', '').startswith(f"bytes {start}-"):
+                    # Range ignored or file changed on the server, pieces would not fit together
+                    logger.error(f"Server did not return bytes {start}-{end} of {url}")
+                    return False
+                
+                written = 0
+                with open(part_path, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+            
+            if written == end - start + 1:
+                return True
+            logger.warning(f"Incomplete range {start}-{end} on attempt {attempt} ({written} bytes)")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Range {start}-{end} failed on attempt {attempt}: {e}")
+        
+        if attempt < max_retries:
+            time.sleep(2 ** (attempt - 1))
+    
+    return False
+
+
+def download_file_parallel(url: str, output_path: str, connections: int = 4, piece_size: int = 4 * 1024 * 1024,
+                           max_retries: int = 3, timeout: int = 600, force: bool = False) -> bool:
+    """
+    Download a large file over several connections using byte ranges
+    
+    The file is split into pieces that are fetched concurrently and written
+    at their offset in a preallocated file. Servers without range support,
+    compressed responses and small files go through download_file instead.
+    
+    Args:
+        url: URL to download from
+        output_path: Local path to save file
+        connections: Maximum number of simultaneous connections to the server
+        piece_size: Bytes requested per range
+        max_retries: Maximum number of retry attempts per piece
+        timeout: Timeout in seconds for each request
+        force: If True, re-download even if file exists (default: False)
+        
+    Returns:
+        True if download successful, False otherwise
+    """
+    if os.path.exists(output_path) and not force and _cached_file_is_current(url, output_path, _SESSION):
+        logger.info(f"File already exists, using cached version: {output_path}")
+        logger.info(f"Use force=True to re-download")
+        return True
+    
+    try:
+        head = _SESSION.head(url, timeout=30, allow_redirects=True)
+        head.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"HEAD request failed, downloading over a single connection: {e}")
+        return download_file(url, output_path, max_retries, timeout, force)
+    
+    content_length = head.headers.get('content-length', '')
+    total_size = int(content_length) if content_length.isdigit() else 0
+    if (head.headers.get('accept-ranges', '').lower() != 'bytes' or head.headers.get('content-encoding')
+            or total_size < 2 * piece_size):
+        return download_file(url, output_path, max_retries, timeout, force)
+    
+    # Validator so a file replaced on the server mid-download is detected
+    etag = head.headers.get('ETag')
+    validator = etag if etag and not etag.startswith('W/') else head.headers.get('Last-Modified')
+    
+    if not _ensure_output_dir(output_path):
+        return False
+    _discard_partial(output_path)
+    part_path = f"{output_path}.part"
+    
+    # Reserve the full size up front so every piece can be written in place
+    with open(part_path, 'wb') as f:
+        try:
+            os.posix_fallocate(f.fileno(), 0, total_size)
+        except (AttributeError, OSError):
+            f.truncate(total_size)
+    
+    pieces = [(start, min(start + piece_size, total_size) - 1) for start in range(0, total_size, piece_size)]
+    workers = max(1, min(connections, len(pieces), _POOL_SIZE))
+    logger.info(f"Downloading {url} in {len(pieces)} pieces over {workers} connections")
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_download_piece, head.url, part_path, start, end, validator, max_retries, timeout)
+            for start, end in pieces
+        ]
+        completed = all([future.result() for future in futures])
+    
+    if not completed:
+        logger.error(f"Parallel download failed: {url}")
+        _discard_partial(output_path)
+        return False
+    
+    os.replace(part_path, output_path)
+    _write_download_meta(output_path, head)
+    logger.info(f"Download completed: {output_path}")
+    return True
+
+
+def download_with_progress_bar(url: str, output_path: str, max_retries: int = 3, timeout: int = 600, force: bool = False,
+                               chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> bool:
     """
     Download file with tqdm progress bar (optional enhancement)
     
@@ -98,6 +671,7 @@ def download_with_progress_bar(url: str, output_path: str, max_retries: int = 3,
         max_retries: Maximum number of retry attempts
         timeout: Timeout in seconds
         force: If True, re-download even if file exists (default: False)
+        chunk_size: Bytes read and written per iteration (default: 1 MiB)
         
     Returns:
         True if download successful, False otherwise
@@ -106,39 +680,46 @@ def download_with_progress_bar(url: str, output_path: str, max_retries: int = 3,
         from tqdm import tqdm
         
         # Check if file already exists (cache support)
-        output_file = Path(output_path)
-        if output_file.exists() and not force:
+        file_exists = os.path.exists(output_path)
+        if file_exists and not force and _cached_file_is_current(url, output_path, _SESSION):
             logger.info(f"File already exists, using cached version: {output_path}")
             logger.info(f"Use force=True to re-download")
             return True
         
-        if output_file.exists() and force:
+        if file_exists and force:
             logger.info(f"Force flag enabled, re-downloading: {output_path}")
+        if force:
+            _discard_partial(output_path)
+        
+        if not _ensure_output_dir(output_path):
+            return False
         
         for attempt in range(1, max_retries + 1):
             try:
                 logger.info(f"Downloading from {url} (attempt {attempt}/{max_retries})")
                 
-                response = requests.get(url, timeout=timeout, stream=True)
-                response.raise_for_status()
+                response, mode, downloaded = _open_resumable(url, output_path, timeout, _SESSION)
                 
                 total_size = int(response.headers.get('content-length', 0))
+                if total_size:
+                    total_size += downloaded
                 
-                # Ensure output directory exists
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_path, 'wb') as f, tqdm(
-                    desc=output_file.name,
+                # Writes through the wrapped file advance the bar, so the loop
+                # does no progress bookkeeping of its own
+                with os.fdopen(_open_part_fd(output_path, mode), 'wb') as part_file, tqdm.wrapattr(
+                    part_file,
+                    'write',
+                    desc=os.path.basename(output_path),
                     total=total_size,
+                    initial=downloaded,
                     unit='B',
                     unit_scale=True,
                     unit_divisor=1024,
-                ) as pbar:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            pbar.update(len(chunk))
+                ) as wrapped:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        wrapped.write(chunk)
                 
+                _finish_download(output_path, response)
                 logger.info(f"Download completed: {output_path}")
                 return True
                 
@@ -161,4 +742,4 @@ def download_with_progress_bar(url: str, output_path: str, max_retries: int = 3,
     except ImportError:
         # tqdm not available, fall back to basic download
         logger.info("tqdm not available, using basic download")
-        return download_file(url, output_path, max_retries, timeout, force)
+        return download_file(url, output_path, max_retries, timeout, force, chunk_size=chunk_size)
@@ -2,16 +2,102 @@
 Download URL Helper - Assists in finding and constructing driver download URLs
 """
 
+import functools
 import json
 import logging
+import marshal
+import os
+import sys
+import threading
 from pathlib import Path
 from typing import Optional, Dict, List
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator, stdlib json is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+# Separator lines of the download suggestions report
+_REPORT_SEP = "=" * 80 + "\n"
+_REPORT_DASH = "-" * 80 + "\n"
+
+# Separator line of print_vendor_info
+_INFO_SEP = "=" * 60
+
+# Parsed vendor patterns keyed by the source file's path, mtime and size, so
+# new processes can skip the JSON parse while the file is unchanged
+PATTERNS_MARSHAL_CACHE = Path.home() / '.cache' / 'b590m-plus' / 'vendor-patterns.marshal'
+
 # Cache for loaded patterns to avoid reloading
 _patterns_cache = None
+_patterns_lock = threading.Lock()
+
+# Exact-name lookups built alongside the cache:
+# vendor name -> vendor info, (vendor name, device type) -> pattern (lowercase keys)
+_vendor_index = {}
+_vendor_device_index = {}
+# Per vendor in file order: (lowercase name, vendor info, lowercase device type -> pattern)
+_vendor_scan = []
+# Vendor names in file order, as returned by list_all_vendors
+_vendor_names = ()
+
+
+def _build_vendor_indexes(data: Dict) -> None:
+    """Index the loaded patterns by lowercase vendor name and device type"""
+    global _vendor_index, _vendor_device_index, _vendor_scan, _vendor_names
+    vendor_index = {}
+    vendor_device_index = {}
+    vendor_scan = []
+    for vendor in data.get('vendors', []):
+        vendor_lower = vendor['name'].lower()
+        vendor_info = {
+            'vendor': vendor['name'],
+            'website': vendor['website'],
+            'patterns': vendor.get('patterns', {})
+        }
+        device_patterns = {}
+        for dtype, pattern in vendor.get('patterns', {}).items():
+            device_patterns.setdefault(dtype.lower(), {
+                'vendor': vendor['name'],
+                'device_type': dtype,
+                'website': vendor['website'],
+                **pattern
+            })
+        vendor_scan.append((vendor_lower, vendor_info, device_patterns))
+        vendor_index.setdefault(vendor_lower, vendor_info)
+        for dtype_lower, pattern in device_patterns.items():
+            vendor_device_index.setdefault((vendor_lower, dtype_lower), pattern)
+    _vendor_index = vendor_index
+    _vendor_device_index = vendor_device_index
+    _vendor_scan = vendor_scan
+    _vendor_names = tuple(vendor['name'] for vendor in data.get('vendors', []))
+
+
+def _read_marshal_cache(cache_key: tuple) -> Optional[Dict]:
+    """Return the marshalled vendor patterns if they were built from the same file state"""
+    try:
+        key, data = marshal.loads(PATTERNS_MARSHAL_CACHE.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    
+    if key != cache_key or not isinstance(data, dict):
+        return None
+    return data
+
+
+def _write_marshal_cache(cache_key: tuple, data: Dict) -> None:
+    """Atomically store the parsed vendor patterns in the on-disk marshal cache"""
+    try:
+        PATTERNS_MARSHAL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = PATTERNS_MARSHAL_CACHE.with_suffix('.tmp')
+        tmp_file.write_bytes(marshal.dumps((cache_key, data)))
+        os.replace(tmp_file, PATTERNS_MARSHAL_CACHE)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not write vendor patterns cache: {e}")
+
 
 def load_vendor_patterns(patterns_file: str = None) -> Optional[Dict]:
     """
@@ -29,6 +115,17 @@ def load_vendor_patterns(patterns_file: str = None) -> Optional[Dict]:
     if _patterns_cache is not None:
         return _patterns_cache
     
+    with _patterns_lock:
+        # Another thread may have loaded the patterns while we waited
+        if _patterns_cache is not None:
+            return _patterns_cache
+        return _load_vendor_patterns_file(patterns_file)
+
+
+def _load_vendor_patterns_file(patterns_file: Optional[str]) -> Optional[Dict]:
+    """Parse the vendor patterns file and fill the cache (caller holds _patterns_lock)"""
+    global _patterns_cache
+    
     try:
         # Default to utils directory
         if patterns_file is None:
@@ -41,10 +138,16 @@ def load_vendor_patterns(patterns_file: str = None) -> Optional[Dict]:
             logger.error(f"Vendor patterns file not found: {patterns_file}")
             return None
             
-        with open(patterns_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        stat = patterns_path.stat()
+        cache_key = (str(patterns_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        data = _read_marshal_cache(cache_key)
+        if data is None:
+            raw = patterns_path.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            _write_marshal_cache(cache_key, data)
         
         # Cache the loaded data
+        _build_vendor_indexes(data)
         _patterns_cache = data
         logger.info(f"Loaded patterns for {len(data.get('vendors', []))} vendors")
         return data
@@ -57,6 +160,7 @@ def load_vendor_patterns(patterns_file: str = None) -> Optional[Dict]:
         return None
 
 
+@functools.lru_cache(maxsize=512)
 def get_vendor_pattern(vendor_name: str, device_type: str = None) -> Optional[Dict]:
     """
     Get download pattern for a specific vendor and device type
@@ -67,40 +171,38 @@ def get_vendor_pattern(vendor_name: str, device_type: str = None) -> Optional[Di
         
     Returns:
         Dictionary with pattern information or None if not found
+        (cached and shared between calls, do not modify)
     """
     patterns_data = load_vendor_patterns()
     if not patterns_data:
         return None
     
-    # Find vendor (flexible matching - check if vendor name contains pattern name)
     vendor_name_lower = vendor_name.lower()
-    for vendor in patterns_data.get('vendors', []):
-        vendor_pattern_name = vendor['name'].lower()
-        
-        # Match if exact or if vendor_name contains the pattern name
-        if vendor_pattern_name == vendor_name_lower or vendor_pattern_name in vendor_name_lower:
-            if device_type:
-                # Return specific device type pattern
-                device_patterns = vendor.get('patterns', {})
-                for dtype, pattern in device_patterns.items():
-                    if dtype.lower() == device_type.lower():
-                        return {
-                            'vendor': vendor['name'],
-                            'device_type': dtype,
-                            'website': vendor['website'],
-                            **pattern
-                        }
-            else:
+    device_type_lower = device_type.lower() if device_type else None
+    
+    # Exact vendor name: direct lookup in the indexes
+    if device_type_lower:
+        pattern = _vendor_device_index.get((vendor_name_lower, device_type_lower))
+    else:
+        pattern = _vendor_index.get(vendor_name_lower)
+    if pattern is not None:
+        return pattern
+    
+    # Find vendor (flexible matching - check if vendor name contains pattern name)
+    for vendor_pattern_name, vendor_info, device_patterns in _vendor_scan:
+        if vendor_pattern_name in vendor_name_lower:
+            if not device_type_lower:
                 # Return all patterns for vendor
-                return {
-                    'vendor': vendor['name'],
-                    'website': vendor['website'],
-                    'patterns': vendor.get('patterns', {})
-                }
+                return vendor_info
+            # Return specific device type pattern
+            pattern = device_patterns.get(device_type_lower)
+            if pattern is not None:
+                return pattern
     
     return None
 
 
+@functools.lru_cache(maxsize=1024)
 def suggest_download_url(vendor_name: str, device_type: str, driver_name: str = None) -> Dict:
     """
     Suggest download URL and search page for a driver
@@ -111,7 +213,7 @@ def suggest_download_url(vendor_name: str, device_type: str, driver_name: str =
         driver_name: Optional driver name for more specific suggestions
         
     Returns:
-        Dictionary with suggestions
+        Dictionary with suggestions (cached and shared between calls, do not modify)
     """
     pattern = get_vendor_pattern(vendor_name, device_type)
     
@@ -142,11 +244,10 @@ def list_all_vendors() -> List[str]:
     Returns:
         List of vendor names
     """
-    patterns_data = load_vendor_patterns()
-    if not patterns_data:
+    if not load_vendor_patterns():
         return []
     
-    return [vendor['name'] for vendor in patterns_data.get('vendors', [])]
+    return list(_vendor_names)
 
 
 def list_vendor_device_types(vendor_name: str) -> List[str]:
@@ -159,7 +260,11 @@ def list_vendor_device_types(vendor_name: str) -> List[str]:
     Returns:
         List of device type names
     """
-    pattern = get_vendor_pattern(vendor_name)
+    if not load_vendor_patterns():
+        return []
+    
+    # Exact names come straight from the index, others go through the substring match
+    pattern = _vendor_index.get(vendor_name.lower()) or get_vendor_pattern(vendor_name)
     if not pattern or 'patterns' not in pattern:
         return []
     
@@ -179,22 +284,43 @@ def print_vendor_info(vendor_name: str):
         print(f"No information found for vendor: {vendor_name}")
         return
     
-    print(f"\n{'='*60}")
-    print(f"Vendor: {pattern['vendor']}")
-    print(f"{'='*60}")
-    print(f"Website: {pattern['website']}")
-    print()
+    # Collect the whole block and write it to stdout at once
+    lines = [
+        f"\n{_INFO_SEP}",
+        f"Vendor: {pattern['vendor']}",
+        _INFO_SEP,
+        f"Website: {pattern['website']}",
+        "",
+    ]
     
     if 'patterns' in pattern:
-        print("Available Device Types:")
+        lines.append("Available Device Types:")
         for device_type, info in pattern['patterns'].items():
-            print(f"\n  {device_type.upper()}:")
-            print(f"    Search Page: {info.get('search_page', 'N/A')}")
-            print(f"    Pattern: {info.get('direct_download_pattern', 'N/A')}")
-            print(f"    Example: {info.get('example', 'N/A')}")
+            lines.append(f"\n  {device_type.upper()}:")
+            lines.append(f"    Search Page: {info.get('search_page', 'N/A')}")
+            lines.append(f"    Pattern: {info.get('direct_download_pattern', 'N/A')}")
+            lines.append(f"    Example: {info.get('example', 'N/A')}")
             if info.get('notes'):
-                print(f"    Notes: {info['notes']}")
-    print()
+                lines.append(f"    Notes: {info['notes']}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+@functools.lru_cache(maxsize=1024)
+def _report_suggestion_text(vendor_name: str, device_type: str) -> str:
+    """Render the suggestion lines of a report entry, once per vendor and device type"""
+    suggestion = suggest_download_url(vendor_name, device_type)
+    
+    if not suggestion['found']:
+        return ("   Status: No pattern available - manual search required\n"
+                "   Suggestion: Visit vendor website and search for driver\n")
+    
+    lines = [f"   Search Page: {suggestion['search_page']}\n"]
+    if suggestion.get('example'):
+        lines.append(f"   Example URL: {suggestion['example']}\n")
+    if suggestion.get('notes'):
+        lines.append(f"   Notes: {suggestion['notes']}\n")
+    return "".join(lines)
 
 
 def generate_download_suggestions_report(drivers: List[Dict], output_file: str = 'download_suggestions.txt'):
@@ -206,37 +332,26 @@ def generate_download_suggestions_report(drivers: List[Dict], output_file: str =
         output_file: Path to output report file
     """
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("="*80 + "\n")
-            f.write("DRIVER DOWNLOAD SUGGESTIONS REPORT\n")
-            f.write("="*80 + "\n\n")
+        with open(output_file, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+            f.write(f"{_REPORT_SEP}DRIVER DOWNLOAD SUGGESTIONS REPORT\n{_REPORT_SEP}\n")
             
             for i, driver in enumerate(drivers, 1):
                 vendor = driver.get('manufacturer', 'Unknown')
                 device_type = driver.get('deviceType', 'Other').lower()
                 name = driver.get('name', 'Unknown Driver')
                 
-                f.write(f"{i}. {name}\n")
-                f.write(f"   Vendor: {vendor}\n")
-                f.write(f"   Device Type: {device_type}\n")
-                
-                suggestion = suggest_download_url(vendor, device_type, name)
-                
-                if suggestion['found']:
-                    f.write(f"   Search Page: {suggestion['search_page']}\n")
-                    if suggestion.get('example'):
-                        f.write(f"   Example URL: {suggestion['example']}\n")
-                    if suggestion.get('notes'):
-                        f.write(f"   Notes: {suggestion['notes']}\n")
-                else:
-                    f.write(f"   Status: No pattern available - manual search required\n")
-                    f.write(f"   Suggestion: Visit vendor website and search for driver\n")
+                # Build the whole entry and write it at once
+                lines = [
+                    f"{i}. {name}\n",
+                    f"   Vendor: {vendor}\n",
+                    f"   Device Type: {device_type}\n",
+                ]
                 
-                f.write("\n" + "-"*80 + "\n\n")
+                lines.append(_report_suggestion_text(vendor, device_type))
+                lines.append(f"\n{_REPORT_DASH}\n")
+                f.write("".join(lines))
             
-            f.write("\n" + "="*80 + "\n")
-            f.write("END OF REPORT\n")
-            f.write("="*80 + "\n")
+            f.write(f"\n{_REPORT_SEP}END OF REPORT\n{_REPORT_SEP}")
         
         logger.info(f"Download suggestions report generated: {output_file}")
         print(f"Report generated: {output_file}")
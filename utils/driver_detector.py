@@ -3,61 +3,186 @@ Driver Detection Module
 Provides functionality to detect installed drivers and compare with available drivers
 """
 
+import functools
 import json
 import logging
+import os
 import platform
+import re
+import socket
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Any, FrozenSet, Iterable, Iterator, List, Dict, Optional, Tuple, Union
+
+try:
+    import ijson
+except ImportError:  # Optional, manifests are parsed whole with json otherwise
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator, stdlib json is used otherwise
+    orjson = None
+
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:  # Optional, versions are compared numerically otherwise
+    Version = None
 
 logger = logging.getLogger(__name__)
 
+# JSON paths of driver entries in the supported manifest layouts
+_MANIFEST_DRIVER_PREFIXES = frozenset((
+    'item',                             # [...]
+    'drivers.item',                     # {"drivers": [...]}
+    'manufacturers.item.drivers.item',  # {"manufacturers": [{"drivers": [...]}]}
+))
+
+# Manifest suffixes read as newline-delimited JSON (one driver per line)
+_NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+# Bus prefixes stripped from device IDs and the vendor/device parts kept
+_DEVICE_ID_PREFIX_RE = re.compile(r'(?:PCI|HDAUDIO|USB|ACPI)\\')
+_VEN_RE = re.compile(r'VEN_([^&]*)')
+_DEV_RE = re.compile(r'DEV_([^&]*)')
+
+# Significant words of a driver name for the name-based match: alphanumeric
+# runs of 3+ characters, minus filler and vendor words most names share
+_NAME_TERM_RE = re.compile(r'[a-z0-9]{3,}')
+_NAME_STOPWORDS = frozenset({'driver', 'for', 'the', 'and', 'of', 'intel', 'amd', 'nvidia'})
+
+# Persistent cache of the installed-driver scan, reused across invocations
+INSTALLED_DRIVERS_CACHE = Path.home() / '.cache' / 'b590m-plus' / 'installed-drivers.json'
+INSTALLED_DRIVERS_CACHE_TTL = 300  # seconds, 0 disables the cache
+
+# In-process copy of the last scan as (time.monotonic() of the scan, drivers);
+# the lock makes concurrent callers wait for one scan instead of starting their own
+_installed_memo = None
+_installed_lock = threading.Lock()
+
+# Parsed manifests keyed by (resolved path, mtime_ns, size), so repeated
+# queries against an unchanged file read and parse it only once; the least
+# recently used entry is dropped beyond MANIFEST_CACHE_SIZE manifests
+MANIFEST_CACHE_SIZE = 8
+_manifest_cache = OrderedDict()
 
-def load_drivers_manifest(manifest_path: str) -> Optional[List[Dict]]:
+
+def clear_manifest_cache() -> None:
+    """Forget all manifests parsed by load_drivers_manifest"""
+    _manifest_cache.clear()
+
+
+def _iter_ndjson_drivers(lines: Iterable) -> Iterator[Dict]:
+    """
+    Yield the driver objects of a newline-delimited JSON manifest
+    
+    Args:
+        lines: Lines of the manifest (str or bytes), one driver object each;
+            blank lines are skipped
+        
+    Yields:
+        Driver dictionaries
+    """
+    for line in lines:
+        if line.strip():
+            yield orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def _drivers_from_manifest_obj(data: Any) -> Optional[List[Dict]]:
+    """
+    Extract the driver list from an already-parsed manifest object
+    
+    Args:
+        data: Parsed JSON manifest ({"drivers": [...]}, {"manufacturers": [...]}
+            or a direct array)
+        
+    Returns:
+        List of driver dictionaries or None if the format is invalid
+    """
+    # Support {"drivers": [...]}, grouped {"manufacturers": [...]} and direct array format
+    if isinstance(data, dict) and 'drivers' in data:
+        return data['drivers']
+    elif isinstance(data, dict) and 'manufacturers' in data:
+        return [
+            driver
+            for group in data['manufacturers']
+            for driver in group.get('drivers', [])
+        ]
+    elif isinstance(data, list):
+        return data
+    
+    logger.error("Invalid manifest format: expected 'drivers', 'manufacturers' key or array")
+    return None
+
+
+def load_drivers_manifest(manifest_path: Union[str, Path, Dict, List]) -> Optional[List[Dict]]:
     """
     Load drivers from a JSON manifest file
     
+    Files with a .ndjson/.jsonl suffix are read as newline-delimited JSON
+    (one driver object per line); anything else as a single JSON document.
+    
     Args:
-        manifest_path: Path to the drivers JSON manifest file
+        manifest_path: Path to the drivers JSON manifest file, or an
+            already-parsed manifest object (skips reading the file again)
         
     Returns:
         List of driver dictionaries or None if loading fails
     """
+    if not isinstance(manifest_path, (str, Path)):
+        return _drivers_from_manifest_obj(manifest_path)
+    
     try:
-        manifest_file = Path(manifest_path)
-        if not manifest_file.exists():
-            logger.error(f"Manifest file not found: {manifest_path}")
+        manifest_file = manifest_path if isinstance(manifest_path, Path) else Path(manifest_path)
+        try:
+            st = manifest_file.stat()
+        except FileNotFoundError:
+            logger.error("Manifest file not found: %s", manifest_path)
             return None
-            
-        with open(manifest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        # Support both {"drivers": [...]} and direct array format
-        if isinstance(data, dict) and 'drivers' in data:
-            drivers = data['drivers']
-        elif isinstance(data, list):
-            drivers = data
+        
+        cache_key = (str(manifest_file.resolve()), st.st_mtime_ns, st.st_size)
+        drivers = _manifest_cache.get(cache_key)
+        if drivers is not None:
+            _manifest_cache.move_to_end(cache_key)
+            logger.debug("Using cached manifest: %s", manifest_path)
+            return list(drivers)
+        
+        raw = manifest_file.read_bytes()
+        if manifest_file.suffix.lower() in _NDJSON_SUFFIXES:
+            drivers = list(_iter_ndjson_drivers(raw.splitlines()))
         else:
-            logger.error("Invalid manifest format: expected 'drivers' key or array")
-            return None
-            
-        logger.info(f"Loaded {len(drivers)} drivers from manifest: {manifest_path}")
-        return drivers
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            drivers = _drivers_from_manifest_obj(data)
+            if drivers is None:
+                return None
+        
+        # Older versions of the same file can never be hit again
+        for stale_key in [key for key in _manifest_cache if key[0] == cache_key[0]]:
+            del _manifest_cache[stale_key]
+        _manifest_cache[cache_key] = drivers
+        while len(_manifest_cache) > MANIFEST_CACHE_SIZE:
+            _manifest_cache.popitem(last=False)
+        logger.info("Loaded %d drivers from manifest: %s", len(drivers), manifest_path)
+        return list(drivers)
         
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON manifest: {e}")
+        logger.error("Failed to parse JSON manifest: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Error loading manifest: {e}")
+        logger.error("Error loading manifest: %s", e)
         return None
 
 
-def list_available_drivers(manifest_path: str, os_filter: Optional[str] = None) -> List[Dict]:
+def list_available_drivers(manifest_path: Union[str, Path, Dict, List], os_filter: Optional[str] = None) -> List[Dict]:
     """
     List all available drivers from the manifest
     
     Args:
-        manifest_path: Path to the drivers JSON manifest file
+        manifest_path: Path to the drivers JSON manifest file or parsed manifest
         os_filter: Optional OS filter ('windows' or 'linux')
         
     Returns:
@@ -71,181 +196,581 @@ def list_available_drivers(manifest_path: str, os_filter: Optional[str] = None)
     if os_filter:
         os_filter = os_filter.lower()
         drivers = [d for d in drivers if d.get('os', '').lower() == os_filter]
-        logger.info(f"Filtered to {len(drivers)} drivers for OS: {os_filter}")
+        logger.info("Filtered to %d drivers for OS: %s", len(drivers), os_filter)
     
     return drivers
 
 
-def get_installed_drivers_windows() -> List[Dict]:
+def _iter_ijson_drivers(stream) -> Iterator[Dict]:
     """
-    Get list of installed drivers on Windows using DISM and WMI
+    Incrementally yield driver entries from a binary JSON stream using ijson
+    
+    Args:
+        stream: File object opened in binary mode
+        
+    Yields:
+        Driver dictionaries found at any of the supported manifest paths
+    """
+    builder = None
+    depth = 0
+    
+    for prefix, event, value in ijson.parse(stream):
+        if builder is None:
+            if event != 'start_map' or prefix not in _MANIFEST_DRIVER_PREFIXES:
+                continue
+            builder = ijson.ObjectBuilder()
+        
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        
+        if depth == 0:
+            yield builder.value
+            builder = None
+
+
+def _iter_manifest_drivers(manifest_path: Union[str, Path, Dict, List]) -> Iterator[Dict]:
+    """Yield every driver entry of a manifest without OS filtering"""
+    if not isinstance(manifest_path, (str, Path)):
+        yield from load_drivers_manifest(manifest_path) or []
+        return
+    
+    manifest_file = manifest_path if isinstance(manifest_path, Path) else Path(manifest_path)
+    if not manifest_file.exists():
+        logger.error("Manifest file not found: %s", manifest_path)
+        return
+    
+    try:
+        if manifest_file.suffix.lower() in _NDJSON_SUFFIXES:
+            # Newline-delimited JSON: one driver object per line
+            with open(manifest_file, 'rb') as f:
+                yield from _iter_ndjson_drivers(f)
+        elif ijson is not None:
+            with open(manifest_file, 'rb') as f:
+                yield from _iter_ijson_drivers(f)
+        else:
+            yield from load_drivers_manifest(manifest_file) or []
+    except json.JSONDecodeError as e:
+        logger.error("Failed to parse JSON manifest: %s", e)
+    except Exception as e:
+        logger.error("Error streaming manifest: %s", e)
+
+
+def iter_available_drivers(manifest_path: Union[str, Path, Dict, List], os_filter: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream available drivers from the manifest one at a time
+    
+    Uses ijson (when installed) or newline-delimited JSON (.ndjson/.jsonl)
+    so large driver catalogs are never fully loaded into memory.
+    
+    Args:
+        manifest_path: Path to the drivers JSON manifest file or parsed manifest
+        os_filter: Optional OS filter ('windows' or 'linux')
+        
+    Yields:
+        Available driver dictionaries
+    """
+    if os_filter:
+        os_filter = os_filter.lower()
+    
+    for driver in _iter_manifest_drivers(manifest_path):
+        if os_filter and driver.get('os', '').lower() != os_filter:
+            continue
+        yield driver
+
+
+def _setupapi_pnp_drivers() -> Optional[List[Dict]]:
+    """
+    Enumerate present PnP devices in-process through SetupAPI (ctypes)
+    
+    Gives the same data as Win32_PnPSignedDriver (device description,
+    first hardware ID, driver version) without starting PowerShell.
     
     Returns:
-        List of installed driver dictionaries with name, version, deviceId
+        List of installed driver dictionaries, or None if SetupAPI is unavailable
     """
-    installed = []
+    if platform.system() != 'Windows':
+        return None
     
     try:
-        # Use DISM to get driver information
-        result = subprocess.run(
-            ['dism', '/online', '/get-drivers', '/format:table'],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
+        import ctypes
+        import winreg
+        from ctypes import wintypes
+        
+        class SP_DEVINFO_DATA(ctypes.Structure):
+            _fields_ = [
+                ('cbSize', wintypes.DWORD),
+                ('ClassGuid', ctypes.c_byte * 16),
+                ('DevInst', wintypes.DWORD),
+                ('Reserved', ctypes.c_void_p),
+            ]
         
-        if result.returncode == 0:
-            logger.debug("Successfully retrieved driver list from DISM")
-            # Parse DISM output (simplified - would need more robust parsing)
-            lines = result.stdout.split('\n')
-            for line in lines:
+        DIGCF_PRESENT = 0x2
+        DIGCF_ALLCLASSES = 0x4
+        SPDRP_DEVICEDESC = 0x0
+        SPDRP_HARDWAREID = 0x1
+        SPDRP_DRIVER = 0x9
+        ERROR_INSUFFICIENT_BUFFER = 122
+        INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+        
+        setupapi = ctypes.WinDLL('setupapi', use_last_error=True)
+        get_class_devs = setupapi.SetupDiGetClassDevsW
+        get_class_devs.argtypes = [ctypes.c_void_p, wintypes.LPCWSTR, wintypes.HWND, wintypes.DWORD]
+        get_class_devs.restype = ctypes.c_void_p
+        enum_device_info = setupapi.SetupDiEnumDeviceInfo
+        enum_device_info.argtypes = [ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(SP_DEVINFO_DATA)]
+        enum_device_info.restype = wintypes.BOOL
+        get_property = setupapi.SetupDiGetDeviceRegistryPropertyW
+        get_property.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(SP_DEVINFO_DATA), wintypes.DWORD, ctypes.POINTER(wintypes.DWORD),
+            ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD),
+        ]
+        get_property.restype = wintypes.BOOL
+        destroy_list = setupapi.SetupDiDestroyDeviceInfoList
+        destroy_list.argtypes = [ctypes.c_void_p]
+        destroy_list.restype = wintypes.BOOL
+    except (ImportError, OSError, AttributeError) as e:
+        logger.debug("SetupAPI not available: %s", e)
+        return None
+    
+    def read_property(device_info_set, device_info, prop) -> str:
+        # REG_SZ, or the first string of a REG_MULTI_SZ (hardware IDs)
+        buffer = ctypes.create_unicode_buffer(512)
+        required = wintypes.DWORD()
+        for _ in range(2):
+            if get_property(device_info_set, ctypes.byref(device_info), prop, None,
+                            buffer, ctypes.sizeof(buffer), ctypes.byref(required)):
+                return buffer.value
+            if ctypes.get_last_error() != ERROR_INSUFFICIENT_BUFFER:
+                break
+            buffer = ctypes.create_unicode_buffer(required.value // ctypes.sizeof(ctypes.c_wchar) + 1)
+        return ''
+    
+    device_info_set = get_class_devs(None, None, None, DIGCF_PRESENT | DIGCF_ALLCLASSES)
+    if not device_info_set or device_info_set == INVALID_HANDLE_VALUE:
+        logger.debug("SetupDiGetClassDevsW failed with error %s", ctypes.get_last_error())
+        return None
+    
+    drivers = []
+    try:
+        device_info = SP_DEVINFO_DATA()
+        device_info.cbSize = ctypes.sizeof(SP_DEVINFO_DATA)
+        index = 0
+        while enum_device_info(device_info_set, index, ctypes.byref(device_info)):
+            index += 1
+            version = ''
+            driver_key = read_property(device_info_set, device_info, SPDRP_DRIVER)
+            if driver_key:
+                try:
+                    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                                        'SYSTEM\\CurrentControlSet\\Control\\Class\\' + driver_key) as key:
+                        version = winreg.QueryValueEx(key, 'DriverVersion')[0]
+                except OSError:
+                    pass
+            drivers.append({
+                'name': read_property(device_info_set, device_info, SPDRP_DEVICEDESC),
+                'version': version,
+                'deviceId': read_property(device_info_set, device_info, SPDRP_HARDWAREID)
+            })
+    finally:
+        destroy_list(device_info_set)
+    
+    return drivers
+
+
+def _scan_installed_drivers_windows(installed: List[Dict]) -> None:
+    """
+    Append the installed drivers found by DISM and SetupAPI (WMI as fallback)
+    
+    Args:
+        installed: List the driver dictionaries are appended to; it keeps
+            what was found so far when an exception is raised
+    """
+    # Use DISM to get driver information, parsing its table as it is printed
+    dism_cmd = ['dism', '/online', '/get-drivers', '/format:table']
+    dism_drivers = []
+    with subprocess.Popen(dism_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as proc:
+        timer = threading.Timer(60, proc.kill)
+        timer.start()
+        try:
+            for line in proc.stdout:
                 if 'Published Name' in line or '---' in line or not line.strip():
                     continue
                 # Basic parsing - this is a simplified version
                 parts = line.split('|')
                 if len(parts) >= 3:
-                    installed.append({
-                        'name': parts[0].strip() if len(parts) > 0 else '',
-                        'version': parts[2].strip() if len(parts) > 2 else '',
+                    dism_drivers.append({
+                        'name': parts[0].strip(),
+                        'version': parts[2].strip(),
                         'deviceId': ''
                     })
-        
-        # Alternative: Use WMI via PowerShell for more detailed info
-        ps_command = """
-        Get-WmiObject Win32_PnPSignedDriver | 
-        Select-Object DeviceName, DriverVersion, HardwareID | 
-        ConvertTo-Json -Compress
-        """
-        
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        if result.returncode == 0 and result.stdout.strip():
-            try:
-                wmi_drivers = json.loads(result.stdout)
-                if isinstance(wmi_drivers, dict):
-                    wmi_drivers = [wmi_drivers]
-                    
-                for driver in wmi_drivers:
-                    hardware_id = driver.get('HardwareID', [''])[0] if isinstance(driver.get('HardwareID'), list) else driver.get('HardwareID', '')
-                    installed.append({
-                        'name': driver.get('DeviceName', ''),
-                        'version': driver.get('DriverVersion', ''),
-                        'deviceId': hardware_id
-                    })
-                    
-                logger.info(f"Retrieved {len(installed)} drivers from WMI")
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse WMI driver information")
-                
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout while retrieving installed drivers")
-    except FileNotFoundError:
-        logger.error("Required tools (DISM/PowerShell) not found")
-    except Exception as e:
-        logger.error(f"Error retrieving installed drivers: {e}")
+            returncode = proc.wait()
+        finally:
+            timed_out = not timer.is_alive()
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+    if timed_out:
+        raise subprocess.TimeoutExpired(dism_cmd, 60)
     
-    return installed
+    if returncode == 0:
+        logger.debug("Successfully retrieved driver list from DISM")
+        installed.extend(dism_drivers)
+    
+    # Detailed per-device info straight from SetupAPI, no PowerShell needed
+    pnp_drivers = _setupapi_pnp_drivers()
+    if pnp_drivers is not None:
+        installed.extend(pnp_drivers)
+        logger.info("Retrieved %d drivers from SetupAPI", len(installed))
+        return
+    
+    # Alternative: Use WMI via PowerShell for more detailed info
+    ps_command = """
+    Get-WmiObject Win32_PnPSignedDriver | 
+    Select-Object DeviceName, DriverVersion, HardwareID | 
+    ConvertTo-Json -Compress
+    """
+    
+    result = subprocess.run(
+        ['powershell', '-Command', ps_command],
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    
+    if result.returncode == 0 and result.stdout.strip():
+        try:
+            wmi_drivers = json.loads(result.stdout)
+            if isinstance(wmi_drivers, dict):
+                wmi_drivers = [wmi_drivers]
+                
+            for driver in wmi_drivers:
+                hardware_id = driver.get('HardwareID', [''])[0] if isinstance(driver.get('HardwareID'), list) else driver.get('HardwareID', '')
+                installed.append({
+                    'name': driver.get('DeviceName', ''),
+                    'version': driver.get('DriverVersion', ''),
+                    'deviceId': hardware_id
+                })
+                
+            logger.info("Retrieved %d drivers from WMI", len(installed))
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse WMI driver information")
 
 
-def get_installed_drivers_linux() -> List[Dict]:
+def get_installed_drivers_windows() -> List[Dict]:
     """
-    Get list of installed drivers on Linux using lsmod and modinfo
+    Get list of installed drivers on Windows using DISM and SetupAPI (WMI as fallback)
     
     Returns:
         List of installed driver dictionaries with name, version, deviceId
     """
-    installed = []
+    return _run_installed_scan(_scan_installed_drivers_windows, 'DISM/PowerShell')[0]
+
+
+def _loaded_module_names() -> List[str]:
+    """
+    Names of the loaded kernel modules, from /proc/modules (lsmod as fallback)
+    
+    Returns:
+        Module names in load order
+    """
+    try:
+        with open('/proc/modules', 'r', encoding='utf-8') as f:
+            return [line.split(None, 1)[0] for line in f if line.strip()]
+    except OSError:
+        pass
     
+    result = subprocess.run(
+        ['lsmod'],
+        capture_output=True,
+        text=True,
+        timeout=30
+    )
+    if result.returncode != 0:
+        return []
+    # Skip header
+    return [line.split()[0] for line in result.stdout.split('\n')[1:] if line.strip()]
+
+
+def _read_module_pci_aliases() -> Optional[Dict[str, str]]:
+    """
+    Map module names to their PCI alias using depmod's modules.alias
+    
+    One read of this file replaces a modinfo call per module. As with
+    modinfo, the last pci: alias listed for a module is kept.
+    
+    Returns:
+        Dictionary module name -> PCI alias, or None if the file is unavailable
+    """
+    aliases_file = Path('/lib/modules') / platform.release() / 'modules.alias'
+    aliases = {}
     try:
-        # Get loaded kernel modules
-        result = subprocess.run(
-            ['lsmod'],
+        with open(aliases_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.startswith('alias pci:'):
+                    continue
+                parts = line.split()
+                if len(parts) == 3:
+                    aliases[parts[2].replace('-', '_')] = parts[1]
+    except OSError:
+        return None
+    return aliases
+
+
+def _read_module_version(module_name: str) -> str:
+    """Return the MODULE_VERSION of a loaded module from sysfs, '' if it has none"""
+    try:
+        with open(f"/sys/module/{module_name}/version", 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def _run_modinfo(module_name: str) -> Optional[Dict]:
+    """
+    Read version and PCI alias of a module with modinfo
+    
+    Returns:
+        Installed driver dictionary, or None if modinfo failed
+    """
+    try:
+        modinfo_result = subprocess.run(
+            ['modinfo', module_name],
             capture_output=True,
             text=True,
-            timeout=30
+            timeout=5
         )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    
+    if modinfo_result.returncode != 0:
+        return None
+    
+    version = ''
+    alias = ''
+    for line in modinfo_result.stdout.split('\n'):
+        if line.startswith('version:'):
+            version = line.split(':', 1)[1].strip()
+        elif line.startswith('alias:') and 'pci:' in line:
+            alias = line.split(':', 1)[1].strip()
+    
+    return {
+        'name': module_name,
+        'version': version,
+        'deviceId': alias
+    }
+
+
+def _scan_installed_drivers_linux(installed: List[Dict]) -> None:
+    """
+    Append the loaded kernel modules with their version and PCI alias
+    
+    Args:
+        installed: List the driver dictionaries are appended to; it keeps
+            what was found so far when an exception is raised
+    """
+    module_names = _loaded_module_names()
+    aliases = _read_module_pci_aliases()
+    
+    if aliases is not None:
+        for module_name in module_names:
+            installed.append({
+                'name': module_name,
+                'version': _read_module_version(module_name),
+                'deviceId': aliases.get(module_name, '')
+            })
+        logger.info("Retrieved %d drivers from /proc/modules and sysfs", len(installed))
+    else:
+        # Get detailed info for each module, modinfo calls are independent
+        # so several run at once
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = executor.map(_run_modinfo, module_names[:50])  # Limit to first 50 to avoid timeout
+            installed.extend(info for info in results if info is not None)
+        logger.info("Retrieved %d drivers from lsmod/modinfo", len(installed))
+
+
+def get_installed_drivers_linux() -> List[Dict]:
+    """
+    Get list of installed drivers on Linux from /proc/modules and sysfs
+    
+    Versions come from /sys/module/<name>/version and PCI aliases from
+    modules.alias, so no process is started per module. Without
+    modules.alias, modinfo is run for (at most 50) modules instead, on a
+    small thread pool.
+    
+    Returns:
+        List of installed driver dictionaries with name, version, deviceId
+    """
+    return _run_installed_scan(_scan_installed_drivers_linux, 'lsmod/modinfo')[0]
+
+
+def _run_installed_scan(scan, tools: str) -> Tuple[List[Dict], bool]:
+    """
+    Run a platform scan, logging instead of raising its errors
+    
+    Args:
+        scan: _scan_installed_drivers_* function to run
+        tools: Names of the tools the scan depends on, for the error message
         
-        if result.returncode == 0:
-            lines = result.stdout.split('\n')[1:]  # Skip header
-            module_names = []
-            
-            for line in lines:
-                if line.strip():
-                    parts = line.split()
-                    if parts:
-                        module_names.append(parts[0])
-            
-            # Get detailed info for each module
-            for module_name in module_names[:50]:  # Limit to first 50 to avoid timeout
-                try:
-                    modinfo_result = subprocess.run(
-                        ['modinfo', module_name],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    
-                    if modinfo_result.returncode == 0:
-                        version = ''
-                        alias = ''
-                        
-                        for line in modinfo_result.stdout.split('\n'):
-                            if line.startswith('version:'):
-                                version = line.split(':', 1)[1].strip()
-                            elif line.startswith('alias:') and 'pci:' in line:
-                                alias = line.split(':', 1)[1].strip()
-                        
-                        installed.append({
-                            'name': module_name,
-                            'version': version,
-                            'deviceId': alias
-                        })
-                        
-                except subprocess.TimeoutExpired:
-                    continue
-                except Exception:
-                    continue
-            
-            logger.info(f"Retrieved {len(installed)} drivers from lsmod/modinfo")
-            
+    Returns:
+        Tuple (installed drivers found, True if the scan completed without errors)
+    """
+    installed = []
+    try:
+        scan(installed)
+        return installed, True
     except subprocess.TimeoutExpired:
         logger.error("Timeout while retrieving installed drivers")
     except FileNotFoundError:
-        logger.error("Required tools (lsmod/modinfo) not found")
+        logger.error("Required tools (%s) not found", tools)
     except Exception as e:
-        logger.error(f"Error retrieving installed drivers: {e}")
+        logger.error("Error retrieving installed drivers: %s", e)
+    return installed, False
+
+
+def _boot_id() -> str:
+    """
+    Identify the current boot of this machine
     
-    return installed
+    Returns:
+        String that changes on every reboot, or empty string if unknown
+    """
+    try:
+        os_type = platform.system()
+        if os_type == 'Linux':
+            return Path('/proc/sys/kernel/random/boot_id').read_text().strip()
+        elif os_type == 'Windows':
+            import ctypes
+            get_tick_count = ctypes.windll.kernel32.GetTickCount64
+            get_tick_count.restype = ctypes.c_ulonglong
+            boot_time = time.time() - get_tick_count() / 1000
+            # Round to the minute to absorb clock jitter between calls
+            return str(int(boot_time // 60))
+    except Exception:
+        pass
+    return ''
+
+
+def _read_installed_cache(cache_key: List[str]) -> Optional[Tuple[List[Dict], float]]:
+    """Return (cached installed-driver list, age in seconds) if it is fresh and for this boot"""
+    try:
+        age = time.time() - INSTALLED_DRIVERS_CACHE.stat().st_mtime
+        if age > INSTALLED_DRIVERS_CACHE_TTL:
+            return None
+        data = json.loads(INSTALLED_DRIVERS_CACHE.read_bytes())
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(data, dict) or data.get('key') != cache_key:
+        return None
+    # An empty list can only come from a failed scan, never trust it
+    drivers = data.get('drivers')
+    if not drivers:
+        return None
+    return drivers, max(0.0, age)
+
 
+def _write_installed_cache(cache_key: List[str], drivers: List[Dict]) -> None:
+    """Atomically store the installed-driver list in the on-disk cache"""
+    try:
+        INSTALLED_DRIVERS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = INSTALLED_DRIVERS_CACHE.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps({'key': cache_key, 'drivers': drivers}), encoding='utf-8')
+        os.replace(tmp_file, INSTALLED_DRIVERS_CACHE)
+    except OSError as e:
+        logger.debug("Could not write installed drivers cache: %s", e)
 
-def list_installed_drivers() -> List[Dict]:
+
+def _detect_installed_drivers() -> Tuple[List[Dict], bool]:
     """
-    List all installed drivers on the current system
+    Enumerate installed drivers using the platform-specific tools
     
     Returns:
-        List of installed driver dictionaries
+        Tuple (installed drivers, True if the scan completed without errors)
     """
     os_type = platform.system().lower()
     
     if os_type == 'windows':
         logger.info("Detecting installed drivers on Windows...")
-        return get_installed_drivers_windows()
+        return _run_installed_scan(_scan_installed_drivers_windows, 'DISM/PowerShell')
     elif os_type == 'linux':
         logger.info("Detecting installed drivers on Linux...")
-        return get_installed_drivers_linux()
+        return _run_installed_scan(_scan_installed_drivers_linux, 'lsmod/modinfo')
     else:
-        logger.warning(f"Unsupported OS for driver detection: {os_type}")
-        return []
+        logger.warning("Unsupported OS for driver detection: %s", os_type)
+        return [], False
+
+
+def list_installed_drivers(use_cache: bool = True) -> List[Dict]:
+    """
+    List all installed drivers on the current system
+    
+    The scan result is cached in memory and on disk (per host and boot) for
+    INSTALLED_DRIVERS_CACHE_TTL seconds, so repeated calls and back-to-back
+    invocations skip the slow DISM/WMI or lsmod/modinfo enumeration.
+    Empty results and scans that hit an error are never cached.
+    
+    Args:
+        use_cache: Reuse a fresh cached scan if available (default: True)
+    
+    Returns:
+        List of installed driver dictionaries
+    """
+    global _installed_memo
+    cache_enabled = INSTALLED_DRIVERS_CACHE_TTL > 0
+    
+    with _installed_lock:
+        if use_cache and cache_enabled and _installed_memo is not None:
+            scanned_at, drivers = _installed_memo
+            if time.monotonic() - scanned_at <= INSTALLED_DRIVERS_CACHE_TTL:
+                logger.debug("Using list of %d installed drivers scanned earlier in this run", len(drivers))
+                return list(drivers)
+        
+        cache_key = [socket.gethostname(), _boot_id()]
+        
+        installed = None
+        # Age the memo from when the scan actually ran, so a disk cache entry
+        # is not kept alive past INSTALLED_DRIVERS_CACHE_TTL
+        scanned_at = time.monotonic()
+        if use_cache and cache_enabled:
+            cached = _read_installed_cache(cache_key)
+            if cached is not None:
+                installed, age = cached
+                scanned_at -= age
+                logger.info("Using cached list of %d installed drivers from %s (use --no-cache to rescan)",
+                            len(installed), INSTALLED_DRIVERS_CACHE)
+                cacheable = True
+        
+        if installed is None:
+            installed, complete = _detect_installed_drivers()
+            cacheable = complete and bool(installed)
+            if not cacheable:
+                logger.warning("Installed driver scan was empty or incomplete, not caching it")
+            elif cache_enabled:
+                _write_installed_cache(cache_key, installed)
+        
+        if cache_enabled and cacheable:
+            _installed_memo = (scanned_at, installed)
+        return list(installed)
+
+
+def invalidate_installed_drivers_cache() -> None:
+    """Drop the cached installed-driver scan, e.g. after installing drivers"""
+    global _installed_memo
+    with _installed_lock:
+        _installed_memo = None
+        try:
+            INSTALLED_DRIVERS_CACHE.unlink()
+        except OSError:
+            pass
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_device_id(device_id: str) -> str:
     """
-    Normalize device ID for comparison (remove prefixes, convert to lowercase)
+    Normalize device ID for comparison (remove prefixes, convert to uppercase)
     
     Args:
         device_id: Device ID string
@@ -257,92 +782,192 @@ def normalize_device_id(device_id: str) -> str:
         return ''
     
     # Remove common prefixes and normalize
-    device_id = device_id.upper()
-    device_id = device_id.replace('PCI\\', '').replace('HDAUDIO\\', '')
-    device_id = device_id.replace('USB\\', '').replace('ACPI\\', '')
+    device_id = _DEVICE_ID_PREFIX_RE.sub('', device_id.upper())
     
     # Extract VEN and DEV if present
-    if 'VEN_' in device_id and 'DEV_' in device_id:
-        try:
-            ven_start = device_id.index('VEN_') + 4
-            ven_end = device_id.index('&', ven_start) if '&' in device_id[ven_start:] else len(device_id)
-            vendor = device_id[ven_start:ven_end]
-            
-            dev_start = device_id.index('DEV_') + 4
-            dev_end = device_id.index('&', dev_start) if '&' in device_id[dev_start:] else len(device_id)
-            device = device_id[dev_start:dev_end]
-            
-            return f"VEN_{vendor}&DEV_{device}"
-        except (ValueError, IndexError):
-            pass
+    vendor = _VEN_RE.search(device_id)
+    if vendor:
+        device = _DEV_RE.search(device_id)
+        if device:
+            return f"VEN_{vendor.group(1)}&DEV_{device.group(1)}"
     
     return device_id
 
 
-def match_driver(available_driver: Dict, installed_drivers: List[Dict]) -> Optional[Dict]:
+def _name_terms(name: Optional[str]) -> FrozenSet[str]:
+    """Significant lowercase terms of a driver name used by match_driver"""
+    return frozenset(
+        term for term in _NAME_TERM_RE.findall((name or '').lower())
+        if term not in _NAME_STOPWORDS
+    )
+
+
+def build_installed_index(installed_drivers: List[Dict]) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+    """
+    Index installed drivers for match_driver
+    
+    Build it once per installed-driver list and pass it to the
+    match_driver / is_driver_installed calls for that list; without it
+    each call rebuilds the index.
+    
+    Args:
+        installed_drivers: List of installed drivers
+        
+    Returns:
+        Tuple (by_device_id, by_term): normalized device ID -> position of
+        the first installed driver with it, and significant name term ->
+        positions of the installed drivers whose name contains it
+    """
+    by_device_id = {}
+    by_term = {}
+    for position, installed in enumerate(installed_drivers):
+        device_id = normalize_device_id(installed.get('deviceId', ''))
+        if device_id:
+            by_device_id.setdefault(device_id, position)
+        for term in _name_terms(installed.get('name')):
+            by_term.setdefault(term, []).append(position)
+    return by_device_id, by_term
+
+
+def match_driver(available_driver: Dict, installed_drivers: List[Dict],
+                 index: Optional[Tuple[Dict[str, int], Dict[str, List[int]]]] = None) -> Optional[Dict]:
     """
     Find matching installed driver for an available driver
     
+    An installed driver matches by device ID (most reliable) or when at
+    least 2 significant terms of the names are equal (see _name_terms);
+    the first match in installed_drivers order is returned.
+    
     Args:
         available_driver: Driver from manifest
         installed_drivers: List of installed drivers
+        index: Optional result of build_installed_index(installed_drivers),
+            pass it when matching many drivers against the same list
         
     Returns:
         Matching installed driver or None
     """
+    by_device_id, by_term = index if index is not None else build_installed_index(installed_drivers)
+    
+    best = None
     available_device_id = normalize_device_id(available_driver.get('deviceId', ''))
-    available_name = (available_driver.get('name') or '').lower()
-    
-    for installed in installed_drivers:
-        installed_device_id = normalize_device_id(installed.get('deviceId', ''))
-        installed_name = (installed.get('name') or '').lower()
-        
-        # Match by device ID (most reliable)
-        if available_device_id and installed_device_id:
-            if available_device_id == installed_device_id:
-                return installed
-        
-        # Fallback: Match by name (partial match)
-        if available_name and installed_name:
-            # Check if key terms match
-            available_terms = set(available_name.split())
-            installed_terms = set(installed_name.split())
-            common_terms = available_terms & installed_terms
-            
-            # If at least 2 significant terms match, consider it a match
-            if len(common_terms) >= 2:
-                return installed
+    if available_device_id:
+        best = by_device_id.get(available_device_id)
     
-    return None
+    # Fallback: Match by name (at least 2 common significant terms)
+    common_terms = {}
+    for term in _name_terms(available_driver.get('name')):
+        for position in by_term.get(term, ()):
+            common_terms[position] = common_terms.get(position, 0) + 1
+    for position, count in common_terms.items():
+        if count >= 2 and (best is None or position < best):
+            best = position
+    
+    return installed_drivers[best] if best is not None else None
 
 
-def list_not_installed_drivers(manifest_path: str, os_filter: Optional[str] = None) -> List[Dict]:
+def is_driver_installed(available_driver: Dict, installed_drivers: List[Dict],
+                        index: Optional[Tuple[Dict[str, int], Dict[str, List[int]]]] = None) -> bool:
+    """
+    Check whether an available driver is installed
+    
+    Device IDs are looked up in the index first; only drivers without a
+    device ID hit fall back to the name matching done by match_driver.
+    
+    Args:
+        available_driver: Driver from manifest
+        installed_drivers: List of installed drivers
+        index: Optional result of build_installed_index(installed_drivers),
+            pass it when checking many drivers against the same list
+        
+    Returns:
+        True if a matching installed driver exists
+    """
+    if index is None:
+        index = build_installed_index(installed_drivers)
+    device_id = normalize_device_id(available_driver.get('deviceId', ''))
+    if device_id in index[0]:
+        return True
+    return match_driver(available_driver, installed_drivers, index) is not None
+
+
+def _load_available_and_installed(manifest_path: Union[str, Path, Dict, List],
+                                  os_filter: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Load the manifest drivers and the installed drivers
+    
+    When the manifest still has to be read from disk, the installed-driver
+    scan runs on a worker thread meanwhile, so reading and parsing the file
+    is hidden behind the slower scan.
+    
+    Returns:
+        Tuple (available drivers, installed drivers)
+    """
+    if not isinstance(manifest_path, (str, Path)):
+        return list_available_drivers(manifest_path, os_filter), list_installed_drivers()
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        installed_future = executor.submit(list_installed_drivers)
+        available = list_available_drivers(manifest_path, os_filter)
+        return available, installed_future.result()
+
+
+def list_not_installed_drivers(manifest_path: Union[str, Path, Dict, List], os_filter: Optional[str] = None) -> List[Dict]:
     """
     List drivers from manifest that are not currently installed
     
     Args:
-        manifest_path: Path to the drivers JSON manifest file
+        manifest_path: Path to the drivers JSON manifest file or parsed manifest
         os_filter: Optional OS filter ('windows' or 'linux')
         
     Returns:
         List of driver dictionaries that are not installed
     """
-    available = list_available_drivers(manifest_path, os_filter)
-    installed = list_installed_drivers()
+    available, installed = _load_available_and_installed(manifest_path, os_filter)
+    
+    not_installed = _classify(available, installed)[0]
+    logger.info("Found %d drivers not installed", len(not_installed))
+    return not_installed
+
+
+def _classify(available: List[Dict], installed: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, Dict]]]:
+    """
+    Match every available driver once and split the results
     
+    Args:
+        available: Drivers from manifest
+        installed: Installed drivers
+        
+    Returns:
+        Tuple (drivers not installed, (available_driver, installed_driver)
+        pairs whose versions differ)
+    """
+    index = build_installed_index(installed)
     not_installed = []
+    different_versions = []
     for driver in available:
-        if not match_driver(driver, installed):
+        matched = match_driver(driver, installed, index)
+        if matched is None:
             not_installed.append(driver)
-    
-    logger.info(f"Found {len(not_installed)} drivers not installed")
-    return not_installed
+            continue
+        
+        available_version = driver.get('version', '')
+        installed_version = matched.get('version', '')
+        if available_version and installed_version:
+            if compare_versions(installed_version, available_version) != 0:
+                different_versions.append((driver, matched))
+    return not_installed, different_versions
 
 
+@functools.lru_cache(maxsize=1024)
 def compare_versions(version1: str, version2: str) -> int:
     """
     Compare two version strings
     
+    PEP 440 versions are compared with packaging (when installed), which
+    also orders pre-releases correctly; anything else is compared by its
+    numeric dot-separated parts.
+    
     Args:
         version1: First version string
         version2: Second version string
@@ -353,6 +978,13 @@ def compare_versions(version1: str, version2: str) -> int:
     if not version1 or not version2:
         return 0
     
+    if Version is not None:
+        try:
+            parsed1, parsed2 = Version(version1), Version(version2)
+            return (parsed1 > parsed2) - (parsed1 < parsed2)
+        except (InvalidVersion, TypeError):
+            pass
+    
     try:
         # Split versions and compare numerically
         parts1 = [int(x) for x in version1.split('.') if x.isdigit()]
@@ -379,63 +1011,58 @@ def compare_versions(version1: str, version2: str) -> int:
         return 0
 
 
-def list_drivers_with_different_versions(manifest_path: str, os_filter: Optional[str] = None) -> List[Tuple[Dict, Dict]]:
+def list_drivers_with_different_versions(manifest_path: Union[str, Path, Dict, List], os_filter: Optional[str] = None) -> List[Tuple[Dict, Dict]]:
     """
     List drivers that are installed but with different versions than in manifest
     
     Args:
-        manifest_path: Path to the drivers JSON manifest file
+        manifest_path: Path to the drivers JSON manifest file or parsed manifest
         os_filter: Optional OS filter ('windows' or 'linux')
         
     Returns:
         List of tuples (available_driver, installed_driver) with version differences
     """
-    available = list_available_drivers(manifest_path, os_filter)
-    installed = list_installed_drivers()
+    available, installed = _load_available_and_installed(manifest_path, os_filter)
     
-    different_versions = []
-    for driver in available:
-        matched = match_driver(driver, installed)
-        if matched:
-            available_version = driver.get('version', '')
-            installed_version = matched.get('version', '')
-            
-            if available_version and installed_version:
-                comparison = compare_versions(installed_version, available_version)
-                if comparison != 0:
-                    different_versions.append((driver, matched))
-    
-    logger.info(f"Found {len(different_versions)} drivers with different versions")
+    different_versions = _classify(available, installed)[1]
+    logger.info("Found %d drivers with different versions", len(different_versions))
     return different_versions
 
 
-def list_drivers_needing_update(manifest_path: str, os_filter: Optional[str] = None) -> List[Dict]:
+def list_drivers_needing_update(manifest_path: Union[str, Path, Dict, List], os_filter: Optional[str] = None) -> List[Dict]:
     """
     List all drivers that need installation or update
     Combines not installed drivers and drivers with different versions
     
     Args:
-        manifest_path: Path to the drivers JSON manifest file
+        manifest_path: Path to the drivers JSON manifest file or parsed manifest
         os_filter: Optional OS filter ('windows' or 'linux')
         
     Returns:
         List of driver dictionaries that need installation or update
     """
-    not_installed = list_not_installed_drivers(manifest_path, os_filter)
-    different_versions = list_drivers_with_different_versions(manifest_path, os_filter)
+    # Load the manifest and scan the system once for both checks
+    available, installed = _load_available_and_installed(manifest_path, os_filter)
+    
+    not_installed, different_versions = _classify(available, installed)
+    logger.info("Found %d drivers not installed", len(not_installed))
+    logger.info("Found %d drivers with different versions", len(different_versions))
     
     # Combine results
     needing_update = not_installed.copy()
+    seen = {(d.get('name'), d.get('deviceId'), d.get('version')) for d in needing_update}
     
     # Add drivers with different versions (use available driver info)
     for available, installed in different_versions:
-        if available not in needing_update:
+        key = (available.get('name'), available.get('deviceId'), available.get('version'))
+        if key not in seen:
+            seen.add(key)
             # Add note about current version
             driver_copy = available.copy()
             driver_copy['current_version'] = installed.get('version', 'unknown')
             needing_update.append(driver_copy)
     
-    logger.info(f"Total drivers needing installation/update: {len(needing_update)}")
+    logger.info("Total drivers needing installation/update: %d", len(needing_update))
     return needing_update
 
 
@@ -456,13 +1083,16 @@ def export_driver_list(drivers: List[Dict], output_path: str) -> bool:
         # Create parent directory if it doesn't exist
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write JSON with pretty formatting
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({'drivers': drivers}, f, indent=2, ensure_ascii=False)
+        # Write JSON with pretty formatting, serialized in one go
+        if orjson is not None:
+            data = orjson.dumps({'drivers': drivers}, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps({'drivers': drivers}, indent=2, ensure_ascii=False).encode('utf-8')
+        output_file.write_bytes(data)
         
-        logger.info(f"Exported {len(drivers)} drivers to: {output_path}")
+        logger.info("Exported %d drivers to: %s", len(drivers), output_path)
         return True
         
     except Exception as e:
-        logger.error(f"Failed to export driver list: {e}")
+        logger.error("Failed to export driver list: %s", e)
         return False
@@ -2,14 +2,16 @@
 File management utilities
 """
 
+import fnmatch
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 logger = logging.getLogger(__name__)
 
 
-def ensure_directory(directory: str) -> Path:
+def ensure_directory(directory: Union[str, os.PathLike]) -> Path:
     """
     Ensure directory exists, create if it doesn't
     
@@ -19,18 +21,16 @@ def ensure_directory(directory: str) -> Path:
     Returns:
         Path object for the directory
     """
-    dir_path = Path(directory)
-    
-    if dir_path.exists():
-        logger.info(f"Directory already exists: {dir_path}")
+    if os.path.exists(directory):
+        logger.info(f"Directory already exists: {directory}")
     else:
-        dir_path.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Created directory: {dir_path}")
+        os.makedirs(directory, exist_ok=True)
+        logger.info(f"Created directory: {directory}")
     
-    return dir_path
+    return Path(directory)
 
 
-def file_exists(file_path: str) -> bool:
+def file_exists(file_path: Union[str, os.PathLike]) -> bool:
     """
     Check if file exists
     
@@ -40,10 +40,10 @@ def file_exists(file_path: str) -> bool:
     Returns:
         True if file exists, False otherwise
     """
-    return Path(file_path).exists()
+    return os.path.exists(file_path)
 
 
-def get_file_size(file_path: str) -> Optional[int]:
+def get_file_size(file_path: Union[str, os.PathLike]) -> Optional[int]:
     """
     Get file size in bytes
     
@@ -53,10 +53,10 @@ def get_file_size(file_path: str) -> Optional[int]:
     Returns:
         File size in bytes, or None if file doesn't exist
     """
-    path = Path(file_path)
-    if path.exists():
-        return path.stat().st_size
-    return None
+    try:
+        return os.stat(file_path).st_size
+    except (FileNotFoundError, NotADirectoryError):
+        return None
 
 
 def cleanup_temp_files(directory: str, pattern: str = "*.tmp") -> None:
@@ -67,22 +67,32 @@ def cleanup_temp_files(directory: str, pattern: str = "*.tmp") -> None:
         directory: Directory to clean
         pattern: File pattern to match (default: *.tmp)
     """
-    dir_path = Path(directory)
-    
-    if not dir_path.exists():
-        logger.warning(f"Directory does not exist: {dir_path}")
+    if not os.path.exists(directory):
+        logger.warning(f"Directory does not exist: {directory}")
         return
     
     try:
-        temp_files = list(dir_path.glob(pattern))
+        if '/' in pattern or os.sep in pattern:
+            # Patterns reaching into subdirectories need a real glob
+            temp_files = [str(path) for path in Path(directory).glob(pattern)]
+        else:
+            # Single pass over the directory, matching names without a stat per entry
+            with os.scandir(directory) as entries:
+                temp_files = [
+                    entry.path for entry in entries
+                    if fnmatch.fnmatch(entry.name, pattern) and not entry.is_dir(follow_symlinks=False)
+                ]
+        
+        deleted = 0
         for temp_file in temp_files:
             try:
-                temp_file.unlink()
+                os.unlink(temp_file)
+                deleted += 1
                 logger.info(f"Deleted temporary file: {temp_file}")
             except Exception as e:
                 logger.warning(f"Failed to delete {temp_file}: {e}")
         
-        if temp_files:
-            logger.info(f"Cleaned up {len(temp_files)} temporary files")
+        if deleted:
+            logger.info(f"Cleaned up {deleted} temporary files")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
@@ -8,12 +8,17 @@ import os
 import platform
 import logging
 import argparse
+import importlib.util
+import re
 import subprocess
 from typing import Tuple, Optional
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Package name at the start of a requirement line (before specifiers, extras, markers)
+_REQUIREMENT_NAME_RE = re.compile(r'^\s*([A-Za-z0-9_\-.]+)')
+
 
 def check_python_version(min_version: Tuple[int, int] = (3, 7)) -> bool:
     """
@@ -58,26 +63,29 @@ def check_dependencies(requirements_file: str = 'requirements.txt') -> bool:
     
     try:
         # Read requirements file
-        with open(req_path, 'r') as f:
-            lines = f.readlines()
+        lines = req_path.read_text().splitlines()
         
         # Parse package names (ignore comments, empty lines, and version specifiers)
-        packages = []
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                # Extract package name (before >=, ==, <, >, etc.)
-                pkg_name = line.split('>=')[0].split('==')[0].split('<')[0].split('>')[0].split(';')[0].strip()
-                if pkg_name:
-                    packages.append(pkg_name)
+        packages = [
+            match.group(1)
+            for line in lines
+            if not line.lstrip().startswith('#')
+            for match in (_REQUIREMENT_NAME_RE.match(line),)
+            if match
+        ]
         
-        # Check each package
+        # Check each package (locate it only, without executing the module)
         missing_packages = []
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for package in packages:
             try:
-                __import__(package.replace('-', '_'))
-                logger.debug(f"Dependency found: {package}")
-            except ImportError:
+                found = importlib.util.find_spec(package.replace('-', '_')) is not None
+            except (ImportError, ValueError):
+                found = False
+            if found:
+                if debug_enabled:
+                    logger.debug("Dependency found: %s", package)
+            else:
                 missing_packages.append(package)
                 logger.warning(f"Missing dependency: {package}")
         
@@ -2,11 +2,28 @@
 Logging configuration utilities
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
 from datetime import datetime
 
+# Background listener that drains queued records to the log file
+_listener = None
+
+
+def _stop_listener() -> None:
+    """Flush pending records and stop the background log listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(log_file: str = 'setup-drivers.log', verbose: bool = False) -> None:
     """
@@ -30,23 +47,37 @@ def setup_logging(log_file: str = 'setup-drivers.log', verbose: bool = False) ->
         datefmt='%Y-%m-%dT%H:%M:%S'
     )
     
+    # The formats never show thread or process details, skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
-    # Remove existing handlers
+    # Remove existing handlers (and the listener from a previous call)
+    _stop_listener()
     root_logger.handlers.clear()
     
-    # File handler
+    # File handler, rotated at midnight (a week of logs is kept) and only
+    # opened once the first record is written
     log_path = Path(log_file)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
+    if not log_path.parent.exists():
+        log_path.parent.mkdir(parents=True, exist_ok=True)
     
-    file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+    file_handler = TimedRotatingFileHandler(log_file, when='midnight', backupCount=7, encoding='utf-8', delay=True)
     file_handler.setLevel(log_level)
     file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
     
-    # Console handler
+    # Writes to the log file happen on a background thread; callers only enqueue
+    global _listener
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    
+    # Console handler (kept synchronous so it stays ordered with print output)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(console_formatter)
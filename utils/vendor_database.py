@@ -2,59 +2,68 @@
 Vendor Database - Maps hardware vendor IDs to manufacturer information
 """
 
+import functools
+import re
+import types
+from typing import Mapping, Optional
+
 # Vendor ID to Manufacturer mapping (PCI Vendor IDs)
 VENDOR_DATABASE = {
     '8086': {
         'name': 'Intel Corporation',
         'website': 'https://www.intel.com/content/www/us/en/download-center/home.html',
-        'common_products': ['Chipset', 'Network', 'Graphics', 'Management Engine', 'Wireless']
+        'common_products': ('Chipset', 'Network', 'Graphics', 'Management Engine', 'Wireless')
     },
     '1002': {
         'name': 'AMD / ATI',
         'website': 'https://www.amd.com/en/support',
-        'common_products': ['Graphics', 'Chipset', 'Audio']
+        'common_products': ('Graphics', 'Chipset', 'Audio')
     },
     '10DE': {
         'name': 'NVIDIA Corporation',
         'website': 'https://www.nvidia.com/Download/index.aspx',
-        'common_products': ['Graphics', 'Audio']
+        'common_products': ('Graphics', 'Audio')
     },
     '10EC': {
         'name': 'Realtek Semiconductor',
         'website': 'https://www.realtek.com/en/downloads',
-        'common_products': ['Audio', 'Network', 'Card Reader', 'Storage']
+        'common_products': ('Audio', 'Network', 'Card Reader', 'Storage')
     },
     '14E4': {
         'name': 'Broadcom',
         'website': 'https://www.broadcom.com/support/download-search',
-        'common_products': ['Network', 'Wireless', 'Bluetooth']
+        'common_products': ('Network', 'Wireless', 'Bluetooth')
     },
     '1CC1': {
         'name': 'ADATA Technology',
         'website': 'https://www.adata.com/en/support/downloads',
-        'common_products': ['Storage', 'NVMe']
+        'common_products': ('Storage', 'NVMe')
     },
     '1043': {
         'name': 'ASUSTeK Computer',
         'website': 'https://www.asus.com/support/download-center/',
-        'common_products': ['Motherboard', 'Utilities']
+        'common_products': ('Motherboard', 'Utilities')
     },
     '1462': {
         'name': 'Micro-Star International (MSI)',
         'website': 'https://www.msi.com/support/download',
-        'common_products': ['Motherboard', 'Graphics']
+        'common_products': ('Motherboard', 'Graphics')
     },
     '1458': {
         'name': 'Gigabyte Technology',
         'website': 'https://www.gigabyte.com/Support',
-        'common_products': ['Motherboard', 'Graphics']
+        'common_products': ('Motherboard', 'Graphics')
     },
     '1022': {
         'name': 'AMD',
         'website': 'https://www.amd.com/en/support',
-        'common_products': ['Processor', 'Chipset']
+        'common_products': ('Processor', 'Chipset')
     },
 }
+# Read-only views: lookups hand out these entries and memoize them
+VENDOR_DATABASE = types.MappingProxyType({
+    vendor_id: types.MappingProxyType(vendor) for vendor_id, vendor in VENDOR_DATABASE.items()
+})
 
 # Device type detection based on device ID patterns
 DEVICE_TYPE_PATTERNS = {
@@ -66,8 +75,33 @@ DEVICE_TYPE_PATTERNS = {
     'PCI': 'PCI Device',
 }
 
+# Driver name keywords per device type, in priority order: when a name
+# contains keywords of several types, the type listed first wins
+_DEVICE_TYPE_KEYWORDS = (
+    ('Audio', ('audio', 'sound')),
+    ('Network', ('network', 'ethernet', 'lan')),
+    ('Wireless', ('wireless', 'wi-fi', 'wifi')),
+    ('Graphics', ('graphics', 'display', 'video', 'radeon', 'geforce')),
+    ('Chipset', ('chipset',)),
+    ('Storage', ('storage', 'disk', 'nvme', 'sata')),
+    ('USB', ('usb',)),
+    ('Bluetooth', ('bluetooth',)),
+    ('Management Engine', ('management engine', 'mei')),
+)
+_KEYWORD_DEVICE_TYPE = {
+    keyword: (priority, device_type)
+    for priority, (device_type, keywords) in enumerate(_DEVICE_TYPE_KEYWORDS)
+    for keyword in keywords
+}
+# Zero-width lookahead so that overlapping keywords are all reported; ASCII
+# case folding matches the names without lowercasing them first
+_DEVICE_TYPE_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in _KEYWORD_DEVICE_TYPE) + '))',
+    re.IGNORECASE | re.ASCII
+)
+
 # Windows generic drivers that should be excluded
-WINDOWS_GENERIC_DRIVERS = [
+WINDOWS_GENERIC_DRIVERS = (
     'WAN Miniport',
     'Generic software',
     'Microsoft',
@@ -89,9 +123,42 @@ WINDOWS_GENERIC_DRIVERS = [
     'Device Firmware',
     'System Firmware',
     'UEFI',
-]
+)
+
+# Single case-insensitive alternation over the generic name fragments
+_GENERIC_RE = re.compile(
+    '|'.join(re.escape(pattern) for pattern in WINDOWS_GENERIC_DRIVERS),
+    re.IGNORECASE
+)
+
+# ID after VEN_/DEV_: up to the next '&', or at most 4 characters at the end
+# of the string (ACPI IDs use 3-4 letter vendor codes such as VEN_INT)
+_VENDOR_ID_RE = re.compile(r'VEN_(?:([^&]*)&|(.{0,4}))', re.IGNORECASE | re.DOTALL)
+_DEVICE_ID_RE = re.compile(r'DEV_(?:([^&]*)&|(.{0,4}))', re.IGNORECASE | re.DOTALL)
+
+# Filename cleanup for generate_filename
+_VENDOR_SUFFIX_RE = re.compile(r' (?:Corporation|Semiconductor|Technology)')
+_DRIVER_NOISE_RE = re.compile(r'\(R\)|\(TM\)')
+_FILENAME_TRANS = str.maketrans({'/': '-', ' ': '_'})
+
+
+def _is_pci_vendor_layout(device_id: str) -> bool:
+    """Check for the common "PCI\\VEN_XXXX&..." layout (4-character vendor ID at offset 8)"""
+    if device_id[:8].upper() != 'PCI\\VEN_' or len(device_id) < 12 or not device_id[8:12].isalnum():
+        return False
+    return len(device_id) == 12 or device_id[12] == '&'
+
+
+def _search_id(pattern, device_id: str) -> str:
+    """Return the upper-cased ID captured by pattern, or '' when absent"""
+    match = pattern.search(device_id)
+    if match is None:
+        return ''
+    value = match.group(1)
+    return (value if value is not None else match.group(2)).upper()
 
 
+@functools.lru_cache(maxsize=1024)
 def extract_vendor_id(device_id: str) -> str:
     """
     Extract vendor ID from device ID string
@@ -105,21 +172,14 @@ def extract_vendor_id(device_id: str) -> str:
     if not device_id:
         return ''
     
-    device_id = device_id.upper()
-    
-    # Try to extract VEN_ pattern
-    if 'VEN_' in device_id:
-        try:
-            start = device_id.index('VEN_') + 4
-            end = device_id.index('&', start) if '&' in device_id[start:] else start + 4
-            vendor_id = device_id[start:end]
-            return vendor_id
-        except (ValueError, IndexError):
-            pass
+    # Fast path: slice the ID out of "PCI\VEN_XXXX&..." without scanning
+    if _is_pci_vendor_layout(device_id):
+        return device_id[8:12].upper()
     
-    return ''
+    return _search_id(_VENDOR_ID_RE, device_id)
 
 
+@functools.lru_cache(maxsize=1024)
 def extract_device_id(device_id: str) -> str:
     """
     Extract device ID from device ID string
@@ -133,22 +193,16 @@ def extract_device_id(device_id: str) -> str:
     if not device_id:
         return ''
     
-    device_id = device_id.upper()
-    
-    # Try to extract DEV_ pattern
-    if 'DEV_' in device_id:
-        try:
-            start = device_id.index('DEV_') + 4
-            end = device_id.index('&', start) if '&' in device_id[start:] else start + 4
-            dev_id = device_id[start:end]
-            return dev_id
-        except (ValueError, IndexError):
-            pass
+    # Fast path: slice the ID out of "PCI\VEN_XXXX&DEV_YYYY&..." without scanning
+    if (_is_pci_vendor_layout(device_id) and device_id[12:17].upper() == '&DEV_' and device_id[17:21].isalnum()
+            and len(device_id) >= 21 and (len(device_id) == 21 or device_id[21] == '&')):
+        return device_id[17:21].upper()
     
-    return ''
+    return _search_id(_DEVICE_ID_RE, device_id)
 
 
-def get_vendor_info(device_id: str) -> dict:
+@functools.lru_cache(maxsize=1024)
+def get_vendor_info(device_id: str) -> Optional[Mapping]:
     """
     Get vendor information from device ID
     
@@ -156,16 +210,12 @@ def get_vendor_info(device_id: str) -> dict:
         device_id: Device ID string
         
     Returns:
-        Dictionary with vendor name and website, or None if not found
+        Read-only mapping with vendor name and website, or None if not found
     """
-    vendor_id = extract_vendor_id(device_id)
-    
-    if vendor_id in VENDOR_DATABASE:
-        return VENDOR_DATABASE[vendor_id]
-    
-    return None
+    return VENDOR_DATABASE.get(extract_vendor_id(device_id))
 
 
+@functools.lru_cache(maxsize=1024)
 def is_generic_windows_driver(driver_name: str) -> bool:
     """
     Check if driver is a generic Windows driver that shouldn't be included
@@ -179,15 +229,10 @@ def is_generic_windows_driver(driver_name: str) -> bool:
     if not driver_name:
         return True
     
-    driver_name_lower = driver_name.lower()
-    
-    for generic_pattern in WINDOWS_GENERIC_DRIVERS:
-        if generic_pattern.lower() in driver_name_lower:
-            return True
-    
-    return False
+    return _GENERIC_RE.search(driver_name) is not None
 
 
+@functools.lru_cache(maxsize=1024)
 def detect_device_type(driver_name: str, device_id: str) -> str:
     """
     Detect device type from driver name and device ID
@@ -202,27 +247,13 @@ def detect_device_type(driver_name: str, device_id: str) -> str:
     if not driver_name:
         return 'Unknown'
     
-    driver_name_lower = driver_name.lower()
-    
-    # Check common patterns in driver name
-    if 'audio' in driver_name_lower or 'sound' in driver_name_lower:
-        return 'Audio'
-    elif 'network' in driver_name_lower or 'ethernet' in driver_name_lower or 'lan' in driver_name_lower:
-        return 'Network'
-    elif 'wireless' in driver_name_lower or 'wi-fi' in driver_name_lower or 'wifi' in driver_name_lower:
-        return 'Wireless'
-    elif 'graphics' in driver_name_lower or 'display' in driver_name_lower or 'video' in driver_name_lower or 'radeon' in driver_name_lower or 'geforce' in driver_name_lower:
-        return 'Graphics'
-    elif 'chipset' in driver_name_lower:
-        return 'Chipset'
-    elif 'storage' in driver_name_lower or 'disk' in driver_name_lower or 'nvme' in driver_name_lower or 'sata' in driver_name_lower:
-        return 'Storage'
-    elif 'usb' in driver_name_lower:
-        return 'USB'
-    elif 'bluetooth' in driver_name_lower:
-        return 'Bluetooth'
-    elif 'management engine' in driver_name_lower or 'mei' in driver_name_lower:
-        return 'Management Engine'
+    # Check common patterns in driver name (one scan for all keywords)
+    hits = [
+        _KEYWORD_DEVICE_TYPE[match.group(1).lower()]
+        for match in _DEVICE_TYPE_KEYWORD_RE.finditer(driver_name)
+    ]
+    if hits:
+        return min(hits)[1]
     
     # Check device ID patterns
     if device_id:
@@ -234,6 +265,7 @@ def detect_device_type(driver_name: str, device_id: str) -> str:
     return 'Other'
 
 
+@functools.lru_cache(maxsize=1024)
 def generate_filename(vendor_name: str, driver_name: str, device_type: str, version: str) -> str:
     """
     Generate a suggested filename for the driver
@@ -248,16 +280,14 @@ def generate_filename(vendor_name: str, driver_name: str, device_type: str, vers
         Suggested filename
     """
     # Clean up vendor name
-    vendor_clean = vendor_name.replace(' Corporation', '').replace(' Semiconductor', '').replace(' Technology', '')
-    vendor_clean = vendor_clean.replace('/', '-').replace(' ', '_')
+    vendor_clean = _VENDOR_SUFFIX_RE.sub('', vendor_name).translate(_FILENAME_TRANS)
     
     # Use device type if driver name is too generic
     if len(driver_name) > 50 or 'device' in driver_name.lower():
         base_name = f"{vendor_clean}_{device_type}"
     else:
         # Clean up driver name
-        driver_clean = driver_name.replace('(R)', '').replace('(TM)', '').strip()
-        driver_clean = driver_clean.replace(' ', '_').replace('/', '-')
+        driver_clean = _DRIVER_NOISE_RE.sub('', driver_name).strip().translate(_FILENAME_TRANS)
         # Limit length
         if len(driver_clean) > 40:
             driver_clean = driver_clean[:40]
@@ -271,3 +301,10 @@ def generate_filename(vendor_name: str, driver_name: str, device_type: str, vers
         filename = f"{base_name}.exe"
     
     return filename
+
+
+def clear_caches() -> None:
+    """Forget all results memoized by the lookup helpers of this module"""
+    for cached in (extract_vendor_id, extract_device_id, get_vendor_info,
+                   is_generic_windows_driver, detect_device_type, generate_filename):
+        cached.cache_clear()
@@ -8,11 +8,13 @@ __version__ = "1.0.0"
 from validators.hash_validator import (
     calculate_sha256,
     verify_hash,
-    verify_file_integrity
+    verify_file_integrity,
+    verify_files_integrity
 )
 
 __all__ = [
     'calculate_sha256',
     'verify_hash',
     'verify_file_integrity',
+    'verify_files_integrity',
 ]
@@ -2,36 +2,117 @@
 SHA256 hash validation utilities
 """
 
+import functools
 import hashlib
+import hmac
 import logging
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Well-formed SHA256 hex digest
+_SHA256_HEX_RE = re.compile(r'[0-9a-fA-F]{64}')
 
-def calculate_sha256(file_path: str, chunk_size: int = 8192) -> str:
+# Files at least this large are hashed through a memory mapping
+MMAP_HASH_THRESHOLD = 1024 * 1024
+
+
+# hashlib's sha256 comes from OpenSSL, which picks the SHA extensions
+# (SHA-NI on x86, ARMv8 SHA2) at runtime; deployments should use a Python
+# built against OpenSSL >= 1.1.1 so hashing runs at memory bandwidth.
+@functools.lru_cache(maxsize=None)
+def _log_hash_backend() -> None:
+    """Log the OpenSSL build backing hashlib (once per process)"""
+    try:
+        import ssl
+        openssl_version = ssl.OPENSSL_VERSION
+    except ImportError:
+        openssl_version = 'unavailable'
+    logger.debug("SHA256 backend: %s", openssl_version)
+
+
+def _sha256_mapped(f) -> Optional[Any]:
+    """
+    Hash an open file through a read-only memory mapping
+    
+    Args:
+        f: File opened in binary mode
+        
+    Returns:
+        SHA256 hash object, or None if the file cannot be mapped
+    """
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            sha256_hash = hashlib.sha256()
+            sha256_hash.update(mapped)
+            return sha256_hash
+    except (OSError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_sha256(abs_path: str, mtime_ns: int, size: int, chunk_size: int) -> str:
+    """
+    Hash a file; results are memoized per (path, mtime, size) so a file is
+    only read again after it has been replaced or modified
+    """
+    with open(abs_path, 'rb', buffering=0) as f:
+        sha256_hash = None
+        if size >= MMAP_HASH_THRESHOLD:
+            sha256_hash = _sha256_mapped(f)
+        
+        if sha256_hash is None:
+            if hasattr(hashlib, 'file_digest'):
+                sha256_hash = hashlib.file_digest(f, 'sha256')
+            else:
+                sha256_hash = hashlib.sha256()
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    sha256_hash.update(chunk)
+    
+    return sha256_hash.hexdigest()
+
+
+def clear_hash_cache() -> None:
+    """Forget all hashes memoized by calculate_sha256"""
+    _cached_sha256.cache_clear()
+
+
+def calculate_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
     """
     Calculate SHA256 hash of a file
     
+    Hashes are memoized by absolute path, modification time and size, so
+    verifying an unchanged file again does not read it. Files of at least
+    MMAP_HASH_THRESHOLD bytes are hashed from a memory mapping in a single
+    update. Smaller (or unmappable) files are hashed by hashlib.file_digest
+    on Python 3.11+, which runs the read/update loop in C; older versions
+    read them in chunks.
+    
     Args:
         file_path: Path to file
-        chunk_size: Size of chunks to read (default: 8192 bytes)
+        chunk_size: Size of chunks to read when neither a mapping nor
+            hashlib.file_digest is used (default: 1 MiB)
         
     Returns:
         SHA256 hash as hexadecimal string (lowercase)
     """
-    sha256_hash = hashlib.sha256()
+    if logger.isEnabledFor(logging.DEBUG):
+        _log_hash_backend()
     
     try:
-        with open(file_path, 'rb') as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                sha256_hash.update(chunk)
-        
-        hash_value = sha256_hash.hexdigest()
+        stat_result = os.stat(file_path)
+        hash_value = _cached_sha256(os.path.abspath(file_path), stat_result.st_mtime_ns,
+                                    stat_result.st_size, chunk_size)
         logger.debug(f"Calculated SHA256 for {file_path}: {hash_value}")
         return hash_value
         
@@ -50,21 +131,25 @@ def verify_hash(file_path: str, expected_hash: Optional[str]) -> bool:
         
     Returns:
         True if hash matches or no expected hash provided, False if mismatch
+        or if the expected hash is not a SHA256 hex digest
     """
     # If no expected hash, log warning but return True
     if not expected_hash or expected_hash.strip() == '':
         logger.warning(f"No SHA256 hash provided for {file_path}, skipping validation")
         return True
     
+    # A malformed hash can never match, so don't read the file for it
+    expected_hash_lower = expected_hash.strip().lower()
+    if not _SHA256_HEX_RE.fullmatch(expected_hash_lower):
+        logger.error(f"Invalid SHA256 hash for {file_path}: {expected_hash.strip()!r}")
+        return False
+    
     try:
-        # Calculate actual hash
-        actual_hash = calculate_sha256(file_path)
-        
-        # Compare (case-insensitive)
-        expected_hash_lower = expected_hash.lower().strip()
-        actual_hash_lower = actual_hash.lower().strip()
+        # Calculate actual hash (hexdigest is already lowercase)
+        actual_hash_lower = calculate_sha256(file_path)
         
-        if actual_hash_lower == expected_hash_lower:
+        # Compare (case-insensitive, constant time)
+        if hmac.compare_digest(actual_hash_lower, expected_hash_lower):
             logger.info(f"SHA256 validation successful for {file_path}")
             return True
         else:
@@ -78,7 +163,8 @@ def verify_hash(file_path: str, expected_hash: Optional[str]) -> bool:
         return False
 
 
-def verify_file_integrity(file_path: str, expected_hash: Optional[str], file_size: Optional[int] = None) -> bool:
+def verify_file_integrity(file_path: str, expected_hash: Optional[str], file_size: Optional[int] = None,
+                          require_hash: bool = True) -> bool:
     """
     Verify file integrity using hash and optionally file size
     
@@ -86,6 +172,8 @@ def verify_file_integrity(file_path: str, expected_hash: Optional[str], file_siz
         file_path: Path to file
         expected_hash: Expected SHA256 hash
         file_size: Expected file size in bytes (optional)
+        require_hash: If False, skip the SHA256 check and rely on the
+            existence and size checks only (for trusted sources)
         
     Returns:
         True if all checks pass, False otherwise
@@ -107,5 +195,41 @@ def verify_file_integrity(file_path: str, expected_hash: Optional[str], file_siz
             return False
         logger.debug(f"File size check passed: {actual_size} bytes")
     
+    if not require_hash:
+        logger.debug(f"Skipping SHA256 validation for {file_path}")
+        return True
+    
     # Verify hash
     return verify_hash(file_path, expected_hash)
+
+
+def verify_files_integrity(items: List[Tuple[str, Optional[str], Optional[int]]],
+                           workers: Optional[int] = None) -> Dict[str, bool]:
+    """
+    Verify several files concurrently
+    
+    hashlib releases the GIL while hashing large buffers, so the files are
+    hashed in parallel on a thread pool.
+    
+    Args:
+        items: List of (file_path, expected_hash, file_size) tuples, with the
+            same meaning as the verify_file_integrity arguments
+        workers: Maximum number of files hashed at once
+            (default: min(8, number of CPUs))
+        
+    Returns:
+        Dictionary mapping each file_path to True if all its checks passed
+    """
+    if not items:
+        return {}
+    
+    if workers is None:
+        workers = min(8, os.cpu_count() or 1)
+    workers = max(1, min(workers, len(items)))
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            file_path: executor.submit(verify_file_integrity, file_path, expected_hash, file_size)
+            for file_path, expected_hash, file_size in items
+        }
+        return {file_path: future.result() for file_path, future in futures.items()}